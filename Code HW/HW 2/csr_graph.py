@@ -0,0 +1,109 @@
+"""
+A compact graph representation for big inputs.
+
+The homework graphs are dict-of-dicts keyed by string node ids (G[u][v] = weight, or
+True for unweighted graphs). That is easy to read but costs a few hundred bytes per
+edge and a hash lookup per neighbour. CSRGraph turns the node ids into dense ints
+0..n-1 once, and stores the edges in "compressed sparse row" form:
+
+    the out-neighbours of node i are targets[offsets[i]:offsets[i+1]]
+    with matching weights in weights[offsets[i]:offsets[i+1]]
+
+The reverse graph (the same thing as flip_edges) is stored the same way in
+roffsets/rtargets/rweights, so algorithms that need the transpose never build it.
+
+bfs_visited, scc_of_source (homework2.py) and dijkstra (dijkstra.py) all accept a
+CSRGraph in place of the dict and return results keyed by the original labels.
+The same file lives in both homework folders so each one stays self contained.
+"""
+
+from array import array
+
+
+class CSRGraph:
+    """
+    labels[i] is the original node id of int node i, and ids is the inverse map.
+    Nodes that only ever appear as a neighbour still get an id.
+    """
+
+    def __init__(self, G):
+        labels = list(G)
+        ids = {u: i for i, u in enumerate(labels)}
+        for u in G:
+            for v in G[u]:
+                if v not in ids:
+                    ids[v] = len(labels)
+                    labels.append(v)
+        n = len(labels)
+
+        offsets = array('q', [0])
+        targets = array('l')
+        weights = array('d')
+        in_degree = [0] * n
+        for u in labels:
+            for v, w in G.get(u, {}).items():
+                j = ids[v]
+                targets.append(j)
+                weights.append(float(w))
+                in_degree[j] += 1
+            offsets.append(len(targets))
+
+        # Reverse graph: bucket every edge (i -> j) under j using a counting sort
+        roffsets = array('q', [0])
+        for k in in_degree:
+            roffsets.append(roffsets[-1] + k)
+        fill = array('q', roffsets[:-1])
+        rtargets = array('l', bytes(targets.itemsize * len(targets)))
+        rweights = array('d', bytes(weights.itemsize * len(weights)))
+        for i in range(n):
+            for e in range(offsets[i], offsets[i + 1]):
+                j = targets[e]
+                rtargets[fill[j]] = i
+                rweights[fill[j]] = weights[e]
+                fill[j] += 1
+
+        self.labels = labels
+        self.ids = ids
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.roffsets = roffsets
+        self.rtargets = rtargets
+        self.rweights = rweights
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __contains__(self, u):
+        return u in self.ids
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def num_edges(self):
+        return len(self.targets)
+
+    def out_edges(self, i):
+        """(target id, weight) pairs for the out-edges of int node i."""
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[lo:hi], self.weights[lo:hi])
+
+    def in_edges(self, i):
+        """(source id, weight) pairs for the in-edges of int node i."""
+        lo, hi = self.roffsets[i], self.roffsets[i + 1]
+        return zip(self.rtargets[lo:hi], self.rweights[lo:hi])
+
+    def __getitem__(self, u):
+        # dict-style view G[u] -> {v: weight} so code written for the dict format
+        # still works (slowly) on a CSRGraph
+        i = self.ids[u]
+        labels = self.labels
+        return {labels[j]: w for j, w in self.out_edges(i)}
+
+    def get(self, u, default=None):
+        if u not in self.ids:
+            return default
+        return self[u]
+
+    def to_dict(self):
+        return {u: self[u] for u in self.labels}
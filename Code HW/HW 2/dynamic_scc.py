@@ -0,0 +1,218 @@
+# Strongly connected components of a graph that keeps changing.
+#
+# Start from a graph in the same format homework2.py uses (g[u][v] = anything),
+# then call add_edge / remove_edge. Instead of rerunning scc_of_source or all_sccs
+# on the whole graph, only the components touched by the change are updated.
+
+from homework2 import all_sccs
+
+
+class DynamicSCC:
+    """
+    State:
+        out[u], inn[u]: sets of out-/in-neighbours of u (our own copy of the graph)
+        comp[u]: id of the component containing u
+        members[c]: set of vertices in component c
+        dag_out[c][c2], dag_in[c2][c]: number of edges from component c to c2
+            (the condensation graph, with multiplicities so removals are O(1))
+        ord[c]: position of c in a topological order of the condensation
+            (every edge c -> c2 has ord[c] < ord[c2]), kept up to date Pearce-Kelly style
+
+    add_edge(u, v) with cu = comp[u] != cv = comp[v]:
+        If ord[cu] < ord[cv] the order already allows the edge, so nothing can close
+        a cycle and we're done in O(1). Otherwise only components with positions
+        between ord[cv] and ord[cu] can be involved: we search forward from cv and
+        backward from cu, both limited to that range. If the forward search finds
+        cu, the components found by both searches are on a cycle with the new edge
+        and get merged. Either way the components found get reassigned the same
+        set of positions: the backward ones first, then the merged component, then
+        the forward ones. That keeps the order topological.
+    remove_edge(u, v) with comp[u] == comp[v]:
+        Only that one component can fall apart, so we rerun Tarjan (all_sccs) on
+        the subgraph induced by its members and split it if needed.
+    Every other case only updates an edge count.
+    """
+
+    def __init__(self, g):
+        self.out = {}
+        self.inn = {}
+        for u in g:
+            self._add_vertex(u)
+            for v in g[u]:
+                self._add_vertex(v)
+                self.out[u].add(v)
+                self.inn[v].add(u)
+
+        comp, members, _ = all_sccs({u: self.out[u] for u in self.out})
+        self.comp = comp
+        self.members = {c: set(group) for c, group in enumerate(members)}
+        self._next_id = len(members)
+        # all_sccs numbers components in reverse topological order. Positions are
+        # tuples so a split can put its pieces at (position of the old component, i),
+        # which sorts right where the old component was.
+        self.ord = {c: (len(members) - 1 - c,) for c in self.members}
+        self._top = len(members)
+        self.dag_out = {c: {} for c in self.members}
+        self.dag_in = {c: {} for c in self.members}
+        for u in self.out:
+            for v in self.out[u]:
+                self._count_edge(comp[u], comp[v], 1)
+
+    # ---- queries
+
+    def scc_of(self, s):
+        """Vertices in the SCC containing s (set() if s is not in the graph)."""
+        if s not in self.comp:
+            return set()
+        return set(self.members[self.comp[s]])
+
+    def same_scc(self, u, v):
+        return u in self.comp and v in self.comp and self.comp[u] == self.comp[v]
+
+    def components(self):
+        return [set(group) for group in self.members.values()]
+
+    # ---- updates
+
+    def add_edge(self, u, v):
+        self._add_vertex(u)
+        self._add_vertex(v)
+        if v in self.out[u]:
+            return
+        self.out[u].add(v)
+        self.inn[v].add(u)
+        cu, cv = self.comp[u], self.comp[v]
+        if cu == cv:
+            return
+        self._count_edge(cu, cv, 1)
+        ord = self.ord
+        lb, ub = ord[cv], ord[cu]
+        if ub < lb:
+            return  # already in topological order, no new cycle
+
+        # components reachable from cv that come before cu in the order
+        forward = {cv}
+        todo = [cv]
+        while todo:
+            c = todo.pop()
+            for c2 in self.dag_out[c]:
+                if c2 not in forward and ord[c2] <= ub:
+                    forward.add(c2)
+                    todo.append(c2)
+        # components that reach cu and come after cv in the order
+        backward = {cu}
+        todo = [cu]
+        while todo:
+            c = todo.pop()
+            for c2 in self.dag_in[c]:
+                if c2 not in backward and ord[c2] >= lb:
+                    backward.add(c2)
+                    todo.append(c2)
+
+        slots = sorted(ord[c] for c in forward | backward)
+        if cu in forward:
+            cycle = forward & backward
+            before = sorted(backward - cycle, key=ord.get)
+            after = sorted(forward - cycle, key=ord.get)
+            keep = self._merge(cycle)
+            ord[keep] = slots[len(before)]
+        else:
+            before = sorted(backward, key=ord.get)
+            after = sorted(forward, key=ord.get)
+        for c, slot in zip(before, slots):
+            ord[c] = slot
+        for c, slot in zip(after, slots[len(slots) - len(after):]):
+            ord[c] = slot
+
+    def remove_edge(self, u, v):
+        """Remove the edge u -> v. Raises KeyError if it isn't there."""
+        if u not in self.out or v not in self.out[u]:
+            raise KeyError((u, v))
+        self.out[u].discard(v)
+        self.inn[v].discard(u)
+        cu, cv = self.comp[u], self.comp[v]
+        if cu != cv:
+            self._count_edge(cu, cv, -1)
+            return
+
+        group = self.members[cu]
+        sub = {w: [x for x in self.out[w] if x in group] for w in group}
+        _, pieces, _ = all_sccs(sub)
+        if len(pieces) == 1:
+            return
+        self._split(cu, pieces)
+
+    # ---- helpers
+
+    def _add_vertex(self, u):
+        if u in self.out:
+            return
+        self.out[u] = set()
+        self.inn[u] = set()
+        if hasattr(self, "comp"):
+            c = self._new_id()
+            self.comp[u] = c
+            self.members[c] = {u}
+            self.ord[c] = (self._top,)
+            self._top += 1
+
+    def _new_id(self):
+        c = self._next_id
+        self._next_id += 1
+        self.dag_out[c] = {}
+        self.dag_in[c] = {}
+        return c
+
+    def _count_edge(self, a, b, k):
+        if a == b:
+            return
+        n = self.dag_out[a].get(b, 0) + k
+        if n:
+            self.dag_out[a][b] = n
+            self.dag_in[b][a] = n
+        else:
+            del self.dag_out[a][b]
+            del self.dag_in[b][a]
+
+    def _merge(self, cycle):
+        """Merge the components in cycle into one and return its id."""
+        # keep the id of the biggest component so the fewest vertices get relabeled
+        keep = max(cycle, key=lambda c: len(self.members[c]))
+        for c in cycle:
+            if c == keep:
+                continue
+            del self.ord[c]
+            for w in self.members[c]:
+                self.comp[w] = keep
+            self.members[keep] |= self.members.pop(c)
+            for c2, n in self.dag_out.pop(c).items():
+                del self.dag_in[c2][c]
+                # edges into another merged component become internal (dropped)
+                self._count_edge(keep, c2 if c2 not in cycle else keep, n)
+            for c2, n in self.dag_in.pop(c).items():
+                del self.dag_out[c2][c]
+                self._count_edge(c2 if c2 not in cycle else keep, keep, n)
+        return keep
+
+    def _split(self, c, pieces):
+        # pieces come from all_sccs, so in reverse topological order
+        group = self.members.pop(c)
+        position = self.ord.pop(c)
+        for c2 in self.dag_out.pop(c):
+            del self.dag_in[c2][c]
+        for c2 in self.dag_in.pop(c):
+            del self.dag_out[c2][c]
+        for i, piece in enumerate(pieces):
+            c_new = self._new_id()
+            self.members[c_new] = set(piece)
+            self.ord[c_new] = position + (len(pieces) - 1 - i,)
+            for w in piece:
+                self.comp[w] = c_new
+        # recount every edge with an endpoint in the old component
+        for w in group:
+            cw = self.comp[w]
+            for x in self.out[w]:
+                self._count_edge(cw, self.comp[x], 1)
+            for x in self.inn[w]:
+                if x not in group:
+                    self._count_edge(self.comp[x], cw, 1)
@@ -5,12 +5,35 @@
 # Student submission file name on Gradescope: homework2.py
 #Collaborators: none
 
+import time
 
-def bfs_visited(g, s):
+# numpy is only needed for backend="numpy" and takes a few hundred ms to import, so
+# _numpy_arrays imports it the first time that backend is used
+np = None
+
+
+def bfs_visited(g, s, stats=None, backend="python"):
     """
     This is the pseudocode from class writen in python
     with an extra set "visited" which will make your life easier
+
+    g can also be a CSRGraph, in which case the search runs on int ids and the
+    results are mapped back to the original labels.
+
+    If stats is a dict, the number of edges looked at is added to stats["edges_scanned"].
+
+    backend="numpy" expands a whole layer at a time with numpy. The layers, dist
+    and visited it returns are the same as the plain python version, layer order
+    included. Pass a CSRGraph to get the speedup: its numpy arrays are made once
+    and kept, while a dict g is converted to a CSRGraph again on every call, which
+    costs more than the python BFS saves on small graphs.
     """
+    if backend == "numpy":
+        return _bfs_visited_csr(_as_csr(g), s, stats, backend)
+    if backend != "python":
+        raise ValueError(f"unknown bfs_visited backend {backend!r}")
+    if _is_csr(g):
+        return _bfs_visited_csr(g, s, stats)
     layers = {}
     dist = {}
     visited = set()
@@ -21,9 +44,11 @@ def bfs_visited(g, s):
     dist[s] = 0
     visited.add(s)  # s has been visited
     i = 0
+    scanned = 0
     while len(layers[i])>0:
         layers[i+1] = []
         for v in layers[i]:
+            scanned += len(g[v])
             for u in g[v]:
                 if dist[u] == float('inf'):
                     layers[i+1].append(u)
@@ -31,8 +56,197 @@ def bfs_visited(g, s):
                     dist[u] = i+1
                     tree[u] = v
         i += 1
+    if stats is not None:
+        stats["edges_scanned"] = stats.get("edges_scanned", 0) + scanned
+    return layers, dist, visited
+
+def bfs_layers(g, s, max_depth=None, target=None, stop=None):
+    """Lazy version of bfs_visited: yields (i, layer i) one layer at a time.
+
+    Only vertices the search actually reaches get a dist entry, so the cost is
+    proportional to the explored neighbourhood and not to the size of g.
+    The search stops early
+        - after layer max_depth (if given),
+        - after the layer that contains target (if given),
+        - after the layer where stop(v) is True for some vertex v (if given).
+    Since it's a generator the caller can also just break out of the loop.
+    """
+    if s not in g:
+        return
+    if _is_csr(g):
+        labels, offsets, targets = g.labels, g.offsets, g.targets
+        ids = g.ids
+
+        def neighbors(v):
+            i = ids[v]
+            return [labels[j] for j in targets[offsets[i]:offsets[i + 1]]]
+    else:
+        def neighbors(v):
+            return g.get(v, ())
+
+    dist = {s: 0}
+    layer = [s]
+    i = 0
+    while layer:
+        yield i, layer
+        if (target is not None and target in layer) or (stop is not None and any(stop(v) for v in layer)):
+            return
+        if max_depth is not None and i >= max_depth:
+            return
+        nxt = []
+        for v in layer:
+            for u in neighbors(v):
+                if u not in dist:
+                    dist[u] = i + 1
+                    nxt.append(u)
+        layer = nxt
+        i += 1
+
+
+def within_k_hops(g, s, t, k):
+    """True if t can be reached from s using at most k edges."""
+    for _, layer in bfs_layers(g, s, max_depth=k, target=t):
+        if t in layer:
+            return True
+    return False
+
+def _bfs_layers_csr(offsets, targets, n, s_id, stats=None):
+    """Same layer-by-layer BFS as bfs_visited, on CSR arrays and int ids.
+    Returns (layers, dist) with dist a list where -1 means not reached."""
+    dist = [-1] * n
+    dist[s_id] = 0
+    layers = [[s_id]]
+    i = 0
+    scanned = 0
+    while layers[i]:
+        nxt = []
+        for v in layers[i]:
+            scanned += offsets[v + 1] - offsets[v]
+            for u in targets[offsets[v]:offsets[v + 1]]:
+                if dist[u] < 0:
+                    dist[u] = i + 1
+                    nxt.append(u)
+        layers.append(nxt)
+        i += 1
+    if stats is not None:
+        stats["edges_scanned"] = stats.get("edges_scanned", 0) + scanned
+    return layers, dist
+
+
+def _reach_bits(offsets, targets, n, s_id, stats=None):
+    """Vertices reachable from s_id as a packed bitset: bit v of the bytearray
+    (byte v >> 3, bit v & 7) is set when v is reached. No dist is kept, only the
+    current frontier list, so memory is n/8 bytes plus the frontier."""
+    seen = bytearray((n + 7) >> 3)
+    seen[s_id >> 3] |= 1 << (s_id & 7)
+    frontier = [s_id]
+    scanned = 0
+    while frontier:
+        nxt = []
+        for v in frontier:
+            scanned += offsets[v + 1] - offsets[v]
+            for u in targets[offsets[v]:offsets[v + 1]]:
+                byte, bit = u >> 3, 1 << (u & 7)
+                if not seen[byte] & bit:
+                    seen[byte] |= bit
+                    nxt.append(u)
+        frontier = nxt
+    if stats is not None:
+        stats["edges_scanned"] = stats.get("edges_scanned", 0) + scanned
+    return seen
+
+
+def _bits_to_ids(bits):
+    """Ids of the set bits in a packed bitset, skipping over zero bytes."""
+    ids = []
+    for i, byte in enumerate(bits):
+        if byte:
+            base = i << 3
+            for k in range(8):
+                if byte >> k & 1:
+                    ids.append(base + k)
+    return ids
+
+
+def _is_csr(g):
+    # duck typed so this file still imports on its own, without csr_graph.py next to it
+    return hasattr(g, "roffsets")
+
+
+def _as_csr(g):
+    if _is_csr(g):
+        return g
+    from csr_graph import CSRGraph
+    return CSRGraph(g)
+
+
+def _numpy_arrays(g):
+    """numpy copies of g's CSR arrays, made once and kept on the graph object."""
+    global np
+    if np is None:
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("backend='numpy' needs numpy installed") from None
+    arrays = getattr(g, "_numpy_arrays", None)
+    if arrays is None:
+        arrays = g._numpy_arrays = (
+            np.array(g.offsets, dtype=np.int64),
+            np.array(g.targets, dtype=np.int64),
+            np.array(g.roffsets, dtype=np.int64),
+            np.array(g.rtargets, dtype=np.int64),
+        )
+    return arrays
+
+
+def _bfs_layers_numpy(offsets, targets, n, s_id, stats=None):
+    """_bfs_layers_csr with numpy: each layer is expanded with one gather, a mask
+    for unseen vertices and a unique. Keeping the first occurrence of each new
+    vertex gives exactly the order the python loop would have appended them in.
+    Returns (layers, dist) with layers a list of int arrays and dist an int array."""
+    dist = np.full(n, -1, dtype=np.int64)
+    dist[s_id] = 0
+    frontier = np.array([s_id], dtype=np.int64)
+    layers = [frontier]
+    i = 0
+    scanned = 0
+    while frontier.size:
+        starts = offsets[frontier]
+        lengths = offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        scanned += total
+        if total == 0:
+            frontier = frontier[:0]
+        else:
+            # positions targets[starts[k]:starts[k]+lengths[k]] for every k, in order
+            shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+            nbrs = targets[shift + np.arange(total)]
+            nbrs = nbrs[dist[nbrs] < 0]
+            _, first = np.unique(nbrs, return_index=True)
+            frontier = nbrs[np.sort(first)]
+            dist[frontier] = i + 1
+        layers.append(frontier)
+        i += 1
+    if stats is not None:
+        stats["edges_scanned"] = stats.get("edges_scanned", 0) + scanned
+    return layers, dist
+
+
+def _bfs_visited_csr(g, s, stats=None, backend="python"):
+    labels = g.labels
+    if backend == "numpy":
+        offsets, targets, _, _ = _numpy_arrays(g)
+        layers_ids, dist_ids = _bfs_layers_numpy(offsets, targets, len(g), g.ids[s], stats)
+        layers_ids = [layer.tolist() for layer in layers_ids]
+        dist_ids = dist_ids.tolist()
+    else:
+        layers_ids, dist_ids = _bfs_layers_csr(g.offsets, g.targets, len(g), g.ids[s], stats)
+    layers = {i: [labels[v] for v in layer] for i, layer in enumerate(layers_ids)}
+    dist = {labels[v]: (k if k >= 0 else float('inf')) for v, k in enumerate(dist_ids)}
+    visited = {labels[v] for v, k in enumerate(dist_ids) if k >= 0}
     return layers, dist, visited
 
+
 def flip_edges(g):
     flipped = {}
     for u in g:
@@ -42,18 +256,283 @@ def flip_edges(g):
             flipped[v][u] = 1
     return flipped
 
-def scc_of_source(g, s):
+def scc_of_source(g, s, sccs=None, method="bfs", stats=None, backend="python"):
     """Return exactly the vertices in the SCC containing s (or set() if s absent).
 
     Idea: Let F = nodes reachable from s in G.
           Let B = nodes which reach s in G
           Answer = F intersect B.
+
+    If sccs (the result of all_sccs(g)) is passed in, the answer is just read
+    off the precomputed components instead of doing two BFS passes.
+
+    method="dfs" finds the same set with a single Tarjan DFS started at s.
+    It only ever looks at F (the part of g reachable from s) and never builds
+    the flipped graph: s's SCC is the last component that DFS closes.
+
+    backend="numpy" runs both BFS passes with the vectorized layer expansion
+    from bfs_visited (on a CSRGraph, so the backward pass uses the stored
+    reverse arrays; as there, pass a CSRGraph rather than a dict).
+
+    backend="bitset" (also on a CSRGraph) keeps F and B as packed bitsets, one
+    bit per vertex instead of a set entry plus a dist entry, and computes F & B
+    with a single big-int AND.
+
+    If stats is a dict it gets filled in with
+        stats["phases"]: seconds spent in each phase (forward_bfs, transpose,
+                         backward_bfs for the default method; dfs for method="dfs")
+        stats["counters"]: forward_visited, backward_visited, edges_scanned, scc_size
     """
+    if stats is not None:
+        stats["phases"] = phases = {}
+        stats["counters"] = counters = {"edges_scanned": 0}
     if s not in g:
         return set()
-    _, _, F = bfs_visited(g,s)
+    if sccs is not None:
+        comp, members, _ = sccs
+        return set(members[comp[s]])
+    if method == "dfs":
+        t0 = time.perf_counter()
+        index = {}
+        for group in _tarjan_visit(g, s, index, {}, set(), []):
+            pass
+        if stats is not None:
+            phases["dfs"] = time.perf_counter() - t0
+            counters["forward_visited"] = len(index)
+            counters["edges_scanned"] = sum(len(g.get(v, ())) for v in index)
+            counters["scc_size"] = len(group)
+        return set(group)
+    if method != "bfs":
+        raise ValueError(f"unknown scc_of_source method {method!r}")
+    if backend not in ("python", "numpy", "bitset"):
+        raise ValueError(f"unknown scc_of_source backend {backend!r}")
+    if backend == "numpy":
+        t0 = time.perf_counter()
+        g = _as_csr(g)
+        offsets, targets, roffsets, rtargets = _numpy_arrays(g)
+        n, s_id = len(g), g.ids[s]
+        t1 = time.perf_counter()
+        _, F = _bfs_layers_numpy(offsets, targets, n, s_id, counters if stats is not None else None)
+        t2 = time.perf_counter()
+        _, B = _bfs_layers_numpy(roffsets, rtargets, n, s_id, counters if stats is not None else None)
+        t3 = time.perf_counter()
+        both = np.flatnonzero((F >= 0) & (B >= 0))
+        answer = {g.labels[v] for v in both.tolist()}
+        if stats is not None:
+            phases.update(transpose=t1 - t0, forward_bfs=t2 - t1, backward_bfs=t3 - t2)
+            counters["forward_visited"] = int(np.count_nonzero(F >= 0))
+            counters["backward_visited"] = int(np.count_nonzero(B >= 0))
+            counters["scc_size"] = len(answer)
+        return answer
+    if backend == "bitset":
+        t0 = time.perf_counter()
+        g = _as_csr(g)
+        n, s_id = len(g), g.ids[s]
+        t1 = time.perf_counter()
+        F = _reach_bits(g.offsets, g.targets, n, s_id, counters if stats is not None else None)
+        t2 = time.perf_counter()
+        B = _reach_bits(g.roffsets, g.rtargets, n, s_id, counters if stats is not None else None)
+        t3 = time.perf_counter()
+        both = int.from_bytes(F, "little") & int.from_bytes(B, "little")
+        answer = {g.labels[v] for v in _bits_to_ids(both.to_bytes(len(F), "little"))}
+        if stats is not None:
+            phases.update(transpose=t1 - t0, forward_bfs=t2 - t1, backward_bfs=t3 - t2)
+            counters["forward_visited"] = int.from_bytes(F, "little").bit_count()
+            counters["backward_visited"] = int.from_bytes(B, "little").bit_count()
+            counters["scc_size"] = len(answer)
+        return answer
+    if _is_csr(g):
+        # the reverse graph is already stored, so B needs no flip_edges
+        n, s_id = len(g), g.ids[s]
+        t0 = time.perf_counter()
+        _, F = _bfs_layers_csr(g.offsets, g.targets, n, s_id, counters if stats is not None else None)
+        t1 = time.perf_counter()
+        _, B = _bfs_layers_csr(g.roffsets, g.rtargets, n, s_id, counters if stats is not None else None)
+        t2 = time.perf_counter()
+        answer = {g.labels[v] for v in range(n) if F[v] >= 0 and B[v] >= 0}
+        if stats is not None:
+            phases.update(forward_bfs=t1 - t0, transpose=0.0, backward_bfs=t2 - t1)
+            counters["forward_visited"] = n - F.count(-1)
+            counters["backward_visited"] = n - B.count(-1)
+            counters["scc_size"] = len(answer)
+        return answer
+    t0 = time.perf_counter()
+    _, _, F = bfs_visited(g, s, stats=counters if stats is not None else None)
+    t1 = time.perf_counter()
     g_flipped = flip_edges(g)
-    print(g_flipped)
-    _, _, B = bfs_visited(g_flipped,s)
+    t2 = time.perf_counter()
+    _, _, B = bfs_visited(g_flipped, s, stats=counters if stats is not None else None)
+    t3 = time.perf_counter()
     answer = F & B
-    return answer
\ No newline at end of file
+    if stats is not None:
+        phases.update(forward_bfs=t1 - t0, transpose=t2 - t1, backward_bfs=t3 - t2)
+        counters["forward_visited"] = len(F)
+        counters["backward_visited"] = len(B)
+        counters["scc_size"] = len(answer)
+    return answer
+
+def _tarjan_visit(g, root, index, low, on_stack, stack):
+    """Run the iterative Tarjan DFS from root, yielding each SCC (a list) as it closes.
+
+    index/low/on_stack/stack are shared between calls so all_sccs can restart
+    the search from every vertex. len(index) doubles as the DFS counter.
+    The SCC containing root is always the last one yielded.
+    """
+    index[root] = low[root] = len(index)
+    stack.append(root)
+    on_stack.add(root)
+    # each frame is (vertex, iterator over its neighbors)
+    work = [(root, iter(g.get(root, ())))]
+    while work:
+        v, it = work[-1]
+        pushed = False
+        for u in it:
+            if u not in index:
+                index[u] = low[u] = len(index)
+                stack.append(u)
+                on_stack.add(u)
+                work.append((u, iter(g.get(u, ()))))
+                pushed = True
+                break
+            if u in on_stack and index[u] < low[v]:
+                low[v] = index[u]
+        if pushed:
+            continue
+        work.pop()
+        if work:
+            p = work[-1][0]
+            if low[v] < low[p]:
+                low[p] = low[v]
+        if low[v] == index[v]:
+            # v is the root of a component, pop it off the stack
+            group = []
+            while True:
+                w = stack.pop()
+                on_stack.discard(w)
+                group.append(w)
+                if w == v:
+                    break
+            yield group
+
+
+def all_sccs(g):
+    """Label every vertex with its strongly connected component in one O(V+E) pass.
+
+    This is Tarjan's algorithm from class, but written with an explicit stack
+    instead of recursion so big graphs don't hit Python's recursion limit.
+
+    Returns:
+        comp: dict mapping vertex -> component id
+        members: list where members[c] is the list of vertices in component c
+        dag: dict mapping component id -> set of component ids it has an edge to
+             (the condensation graph, with no self loops)
+    Component ids come out in reverse topological order, so every edge of the
+    condensation goes from a higher id to a lower id.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    comp = {}
+    members = []
+
+    vertices = list(g)
+    for u in g:
+        for v in g[u]:
+            if v not in g:
+                vertices.append(v)  # sink nodes that only show up as neighbors
+
+    for root in vertices:
+        if root in index:
+            continue
+        for group in _tarjan_visit(g, root, index, low, on_stack, stack):
+            c = len(members)
+            for w in group:
+                comp[w] = c
+            members.append(group)
+
+    dag = {c: set() for c in range(len(members))}
+    for u in g:
+        cu = comp[u]
+        for v in g[u]:
+            cv = comp[v]
+            if cu != cv:
+                dag[cu].add(cv)
+    return comp, members, dag
+
+
+class SCCQuery:
+    """
+    Answers scc_of(s) for many sources on the same graph.
+
+    all_sccs runs once when the object is built (and again only if the graph
+    changes), after that every query is a dictionary lookup. Sources in the
+    same component get back the very same frozenset object.
+
+    Change the graph through add_edge / remove_edge on this object: they edit g
+    and bump a change counter, and the next scc_of rebuilds. A graph object with
+    its own add_edge / remove_edge and version counter (like VersionedGraph in
+    HW 6's sp_cache.py) works too: the methods here hand the edit to it, and
+    edits made through its own methods are noticed by its version.
+    scc_of only compares those counters, so it stays O(1).
+
+    Edits written straight into the dict can't be noticed that cheaply. is_stale()
+    compares g with the snapshot of its edges taken at the last build, O(V + E),
+    and refresh() rebuilds.
+    """
+
+    def __init__(self, g):
+        self.g = g
+        self.rebuilds = 0
+        self.changes = 0
+        self._build()
+
+    def _build(self):
+        g = self.g
+        self.comp, self.members, self.dag = all_sccs(g)
+        self._cache = {}
+        self._snapshot = {u: frozenset(g[u]) for u in g}
+        self._built_at = self._version()
+
+    def _version(self):
+        return self.changes, getattr(self.g, "version", None)
+
+    def add_edge(self, u, v, weight=1):
+        if hasattr(self.g, "add_edge"):
+            self.g.add_edge(u, v, weight)
+        else:
+            self.g.setdefault(u, {})[v] = weight
+            self.g.setdefault(v, {})
+        self.changes += 1
+
+    def remove_edge(self, u, v):
+        if hasattr(self.g, "remove_edge"):
+            self.g.remove_edge(u, v)
+        else:
+            del self.g[u][v]
+        self.changes += 1
+
+    def refresh(self):
+        """Recompute everything from the current graph."""
+        self._build()
+        self.rebuilds += 1
+
+    def is_stale(self):
+        if self._built_at != self._version():
+            return True
+        g = self.g
+        snapshot = self._snapshot
+        if len(g) != len(snapshot):
+            return True
+        return any(snapshot.get(u) != g[u].keys() for u in g)
+
+    def scc_of(self, s):
+        if self._built_at != self._version():
+            self.refresh()
+        c = self.comp.get(s)
+        if c is None:
+            return frozenset()
+        answer = self._cache.get(c)
+        if answer is None:
+            answer = self._cache[c] = frozenset(self.members[c])
+        return answer
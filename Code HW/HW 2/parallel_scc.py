@@ -0,0 +1,142 @@
+# All SCCs with the forward-backward (FW-BW) divide and conquer algorithm,
+# spread over several processes.
+#
+# One FW-BW step on a (sub)graph:
+#   1. Trim: a vertex with no in-edges or no out-edges (inside the subgraph) is
+#      an SCC on its own. Remove those repeatedly.
+#   2. Pick a pivot p. F = vertices reachable from p, B = vertices that reach p
+#      (BFS on the subgraph and on flip_edges of it). F & B is p's SCC.
+#   3. Every other SCC lies completely inside F - B, B - F or the rest, so those
+#      three subgraphs can be solved independently.
+#
+# Because the three pieces are independent they can go to different worker
+# processes. Each worker keeps splitting its own piece and hands pieces that
+# are still big back to the parent, which gives them to idle workers.
+#
+# When this helps: only the pieces after a split run in parallel, the first trim +
+# split of the whole graph runs in the parent. A random sparse graph is mostly one
+# giant SCC plus vertices trimming removes, so nearly all the work is that first
+# step and there is no speedup (60k vertices / 150k edges: all_sccs 1.2 s, this
+# about 2.1-2.4 s with or without workers). The pool pays off on graphs that break
+# into many large pieces. For a single pass over an ordinary graph all_sccs in
+# homework2.py is faster.
+#
+# Note: with the "spawn" start method (Windows, macOS) call fwbw_sccs from
+# under an `if __name__ == "__main__":` guard.
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from homework2 import bfs_layers, flip_edges
+
+
+def _reach(g, s):
+    # bfs_layers only touches what it reaches, unlike bfs_visited which sets up
+    # dist for every vertex of g first
+    reached = set()
+    for _, layer in bfs_layers(g, s):
+        reached.update(layer)
+    return reached
+
+
+def _induced(g, vertices):
+    return {u: {v: True for v in g[u] if v in vertices} for u in vertices}
+
+
+def _trim(g):
+    """Peel off vertices with in- or out-degree 0. Returns (singletons, what's left,
+    flip_edges of what's left) so the backward BFS doesn't transpose again."""
+    indeg = {u: 0 for u in g}
+    for u in g:
+        for v in g[u]:
+            indeg[v] += 1
+    outdeg = {u: len(g[u]) for u in g}
+    rin = flip_edges(g)
+    removed = set()
+    todo = [u for u in g if indeg[u] == 0 or outdeg[u] == 0]
+    while todo:
+        u = todo.pop()
+        if u in removed:
+            continue
+        removed.add(u)
+        for v in g[u]:
+            indeg[v] -= 1
+            if indeg[v] == 0 and v not in removed:
+                todo.append(v)
+        for v in rin[u]:
+            outdeg[v] -= 1
+            if outdeg[v] == 0 and v not in removed:
+                todo.append(v)
+    singletons = [{u} for u in removed]
+    if not removed:
+        return singletons, g, rin
+    keep = set(g) - removed
+    return singletons, _induced(g, keep), _induced(rin, keep)
+
+
+def _fwbw_step(g):
+    """One trim + pivot split. Returns (sccs found, list of subgraphs left to solve)."""
+    sccs, g, rin = _trim(g)
+    if not g:
+        return sccs, []
+    pivot = next(iter(g))
+    F = _reach(g, pivot)
+    B = _reach(rin, pivot)
+    sccs.append(F & B)
+    pieces = []
+    rest = set(g) - (F | B)
+    for part in (F - B, B - F, rest):
+        if part:
+            pieces.append(_induced(g, part))
+    return sccs, pieces
+
+
+def _fwbw_task(g, handoff_size):
+    """Solve g, except pieces with at least handoff_size vertices which are
+    returned unsolved so the parent can give them to another worker."""
+    sccs = []
+    handoff = []
+    todo = [g]
+    while todo:
+        found, pieces = _fwbw_step(todo.pop())
+        sccs.extend(found)
+        for piece in pieces:
+            if len(piece) >= handoff_size:
+                handoff.append(piece)
+            else:
+                todo.append(piece)
+    return sccs, handoff
+
+
+def fwbw_sccs(g, workers=None, handoff_size=10000):
+    """Return the list of SCCs (as sets) of g, g in the homework2 format.
+
+    workers: number of processes. None or 1 runs everything in this process.
+    handoff_size: pieces with at least this many vertices are sent back to the
+        pool instead of being finished by the worker that produced them.
+        Smaller values spread work better but pickle more subgraphs.
+    """
+    full = {}
+    for u in g:
+        full.setdefault(u, {})
+        for v in g[u]:
+            full[u][v] = True
+            full.setdefault(v, {})  # sink nodes that only show up as neighbors
+
+    if not workers or workers == 1:
+        sccs, _ = _fwbw_task(full, float('inf'))
+        return sccs
+
+    sccs = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # the first split happens here so the three pieces start in parallel
+        found, pieces = _fwbw_step(full)
+        sccs.extend(found)
+        running = {pool.submit(_fwbw_task, piece, handoff_size) for piece in pieces}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                found, handoff = future.result()
+                sccs.extend(found)
+                for piece in handoff:
+                    running.add(pool.submit(_fwbw_task, piece, handoff_size))
+    return sccs
@@ -0,0 +1,76 @@
+# random_tests.py
+# CS 330
+# Randomized check of DynamicSCC against rerunning all_sccs from scratch.
+#
+# Each trial builds a small random graph, then makes a run of random add_edge /
+# remove_edge calls (including vertices that are not in the graph yet). After every
+# call the components have to match all_sccs on the current graph, and the kept
+# topological order has to put every condensation edge c -> c2 at ord[c] < ord[c2].
+#
+#   python3 random_tests.py            # 300 graphs, 60 changes each, seed 0
+#   python3 random_tests.py 2000 7     # 2000 graphs, seed 7
+
+import random
+import sys
+
+from dynamic_scc import DynamicSCC
+from homework2 import all_sccs
+
+
+def _as_sets(components):
+    return sorted(sorted(map(str, c)) for c in components)
+
+
+def check_state(D):
+    """None if D agrees with a from-scratch all_sccs, else what is wrong."""
+    _, members, _ = all_sccs({u: D.out[u] for u in D.out})
+    if _as_sets(D.components()) != _as_sets(members):
+        return "components differ from all_sccs"
+    if set(D.ord) != set(D.members):
+        return "ord and members have different component ids"
+    for c, nbrs in D.dag_out.items():
+        for c2 in nbrs:
+            if not D.ord[c] < D.ord[c2]:
+                return f"edge between components {c} -> {c2} goes against the order"
+    return None
+
+
+def check_dynamic_scc(rng, trials, changes=60):
+    for trial in range(trials):
+        n = rng.randint(1, 15)
+        g = {i: {} for i in range(n)}
+        for _ in range(rng.randint(0, 2 * n)):
+            g[rng.randrange(n)][rng.randrange(n)] = True
+        D = DynamicSCC(g)
+        error = check_state(D)
+        if error:
+            return f"graph {trial}, initial build: {error}"
+        for step in range(changes):
+            u, v = rng.randrange(n + 2), rng.randrange(n + 2)
+            if rng.random() < 0.5 and u in D.out and v in D.out[u]:
+                D.remove_edge(u, v)
+                op = "remove_edge"
+            else:
+                D.add_edge(u, v)
+                op = "add_edge"
+            error = check_state(D)
+            if error:
+                return f"graph {trial}, step {step}, {op}({u}, {v}): {error}"
+    return None
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    print(f"\n--- Randomized DynamicSCC check ({trials} graphs, seed {seed}) ---")
+    error = check_dynamic_scc(random.Random(seed), trials)
+    if error is None:
+        print("  ✅ DynamicSCC matches all_sccs after every change")
+    else:
+        print(f"  ❌ {error}")
+    sys.exit(1 if error else 0)
+
+
+if __name__ == "__main__":
+    main()
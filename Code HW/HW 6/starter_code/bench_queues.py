@@ -0,0 +1,53 @@
+# bench_queues.py
+# CS 330
+# Micro-benchmark for the priority queue backends of dijkstra(G, s, queue=...)
+#
+# Runs dijkstra on every graph in input_tests/ with each queue in priorityQue.QUEUES
+# and prints the best of a few runs, plus the number of heap swaps/links.
+#
+#   python3 bench_queues.py            # 5 runs per (graph, queue)
+#   python3 bench_queues.py 20         # 20 runs per (graph, queue)
+
+import os
+import sys
+import time
+
+from dijkstra import dijkstra
+from priorityQue import QUEUES
+from run_local_tests import _pick_dirs, _list_json_inputs, _load_json
+
+
+def bench(G, s, queue, repeats):
+    best = float("inf")
+    stats = {}
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        dijkstra(G, s, stats=stats, queue=queue)
+        best = min(best, time.perf_counter() - t0)
+    return best, stats["counters"]["heap_swaps"]
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    input_dir, _ = _pick_dirs()
+    names = list(QUEUES)
+
+    print(f"\n--- Priority queue benchmark (best of {repeats}) ---")
+    header = f"{'test':<22}{'V':>6}{'E':>8}" + "".join(f"{q:>21}" for q in names)
+    print(header)
+    print("-" * len(header))
+
+    for fname in _list_json_inputs(input_dir):
+        inp = _load_json(os.path.join(input_dir, fname))
+        G = inp["dijkstra"]["graph"]
+        s = inp["dijkstra"]["source"]
+        row = f"{fname:<22}{len(G):>6}{sum(len(n) for n in G.values()):>8}"
+        for q in names:
+            seconds, swaps = bench(G, s, q, repeats)
+            row += f"{seconds * 1000:>10.3f}ms {swaps:>7}"
+        print(row)
+    print("\n(each cell: time, heap swaps or pairing-heap links)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+Contraction hierarchies (CH) for fast point-to-point shortest path queries.
+
+Preprocessing contracts the vertices one at a time, least important first. Contracting v
+removes it from the graph, and for every in-neighbour u and out-neighbour w that are
+still there it adds a shortcut u -> w (weight l(u, v) + l(v, w), remembering v as the
+"middle") unless a witness search finds a path u -> w that avoids v and is at least as
+good. The position of v in that order is its rank.
+
+A query runs two small Dijkstras that only go "up" in rank: forward from s over edges to
+higher ranked vertices, and backward from t over edges coming from higher ranked
+vertices. The best s -> t path is the best meeting point of the two. Shortcuts are then
+expanded recursively through their middle vertex so the path only has original edges.
+
+Like dijkstra, everything works on (distance, edge count) pairs compared
+lexicographically: a shortcut's pair is the sum of the pairs it replaces, and witness
+searches and queries minimise pairs. That way the query returns the same distance as
+dijkstra.dijkstra and, among the shortest paths, one with the fewest edges.
+
+The hierarchy can be saved to / loaded from JSON. Node ids keep their type (strings,
+numbers, tuples of those); save raises TypeError for ids JSON can't bring back.
+
+    ch = ContractionHierarchy.build(G)
+    ch.save("graph.ch.json")
+    distance, path = ch.query(s, t)
+
+Preprocessing pays off on sparse graphs (roads, grids): a 150 x 150 grid builds in
+about 25 s and then answers queries in under 10 ms, against about 240 ms for dijkstra
+with a target. On dense graphs every contraction looks at in-degree * out-degree
+pairs, so building is slower (about 10 s for the 200 vertex / 20k edge test graph),
+though queries stay correct.
+"""
+
+import heapq
+import json
+from math import inf
+
+from dijkstra import _check_weights
+from priorityQue import MinPriorityQueue
+
+
+# hop caps for the witness searches: short ones for the priority estimates, longer ones
+# for the searches that decide which shortcuts actually get added
+PRIORITY_WITNESS_HOPS = 2
+CONTRACT_WITNESS_HOPS = 5
+
+# neighbours of a contracted vertex with at most this many in * out edge pairs get their
+# shortcut estimate redone right away, the others when they come to the top of the heap
+EAGER_ESTIMATE_PAIRS = 64
+
+
+def _add_pair(a, b):
+    return (a[0] + b[0], a[1] + b[1])
+
+
+class ContractionHierarchy:
+
+    def __init__(self, rank, up_out, up_in, middle):
+        self.rank = rank        # vertex -> position in the contraction order
+        self.up_out = up_out    # v -> {w: (weight, edges)} for edges v -> w with rank[w] > rank[v]
+        self.up_in = up_in      # v -> {u: (weight, edges)} for edges u -> v with rank[u] > rank[v]
+        self.middle = middle    # (u, w) -> v for shortcuts u -> w through v
+
+    # ---- preprocessing
+
+    @classmethod
+    def build(cls, G, witness_limit=50):
+        """Contract G (graph dict, non-negative weights).
+
+        witness_limit caps how many vertices one witness search may settle, and
+        CONTRACT_WITNESS_HOPS how many edges its paths may have. When a cap is hit the
+        shortcut is added anyway: an unneeded shortcut costs a little memory but never
+        changes query answers.
+        """
+        _check_weights(G)
+        out_adj = {}
+        in_adj = {}
+        for u, neighbors in G.items():
+            out_adj.setdefault(u, {})
+            in_adj.setdefault(u, {})
+            for v, weight in neighbors.items():
+                out_adj.setdefault(v, {})
+                in_adj.setdefault(v, {})
+                if u != v:  # a self loop is never part of a shortest path
+                    out_adj[u][v] = (weight, 1)
+                    in_adj[v][u] = (weight, 1)
+
+        builder = _Contractor(out_adj, in_adj, witness_limit)
+        return cls(*builder.run())
+
+    # ---- queries
+
+    def query(self, s, t):
+        """Shortest s -> t path as (distance, path), or (inf, []) if there is none.
+        Raises KeyError if s or t is not a vertex of the hierarchy."""
+        for v in (s, t):
+            if v not in self.rank:
+                raise KeyError(v)
+        if s == t:
+            return 0.0, [s]
+        searches = (_UpwardSearch(self.up_out, self.up_in, s),
+                    _UpwardSearch(self.up_in, self.up_out, t))
+        best = (inf, inf)
+        meet = None
+        while True:
+            # advance whichever side has the smaller next key, if it can still help
+            side = min(searches, key=lambda search: search.top())
+            if side.top() >= best:
+                break
+            u, label = side.step()
+            other = searches[1] if side is searches[0] else searches[0]
+            if u in other.done:
+                total = _add_pair(label, other.done[u])
+                if total < best:
+                    best = total
+                    meet = u
+        if meet is None:
+            return inf, []
+
+        ch_path = searches[0].path_to(meet)
+        back = searches[1].path_to(meet)
+        back.reverse()
+        ch_path.extend(back[1:])
+        path = [ch_path[0]]
+        for a, b in zip(ch_path, ch_path[1:]):
+            self._unpack(a, b, path)
+        distance = 0.0
+        for a, b in zip(path, path[1:]):
+            distance += self._edge(a, b)[0]
+        return distance, path
+
+    def _edge(self, a, b):
+        pair = self.up_out.get(a, {}).get(b)
+        if pair is None:
+            pair = self.up_in[b][a]
+        return pair
+
+    def _unpack(self, a, b, path):
+        """Append the original-edge path from a to b (without a) to path."""
+        stack = [(a, b)]
+        while stack:
+            x, y = stack.pop()
+            v = self.middle.get((x, y))
+            if v is None:
+                path.append(y)
+            else:
+                stack.append((v, y))
+                stack.append((x, v))
+
+    # ---- saving
+
+    # The file lists the vertices in rank order once ("labels"); everything else refers
+    # to them by rank, so ids only go through JSON in one place.
+
+    def save(self, path):
+        labels = sorted(self.rank, key=self.rank.get)
+        for v, x in zip(labels, json.loads(json.dumps(labels))):
+            back = _from_json(x)
+            if back != v or type(back) is not type(v):
+                raise TypeError(f"can't save vertex id {v!r}: it would load as {back!r}")
+        rank = self.rank
+
+        def encode(adj):
+            return [[rank[v], rank[w], weight, edges]
+                    for v, nbrs in adj.items() for w, (weight, edges) in nbrs.items()]
+
+        with open(path, "w") as f:
+            json.dump({
+                "labels": labels,
+                "up_out": encode(self.up_out),
+                "up_in": encode(self.up_in),
+                "middle": [[rank[u], rank[w], rank[v]] for (u, w), v in self.middle.items()],
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            data = json.load(f)
+        labels = [_from_json(x) for x in data["labels"]]
+
+        def decode(edges):
+            adj = {v: {} for v in labels}
+            for i, j, weight, count in edges:
+                adj[labels[i]][labels[j]] = (weight, count)
+            return adj
+
+        rank = {v: r for r, v in enumerate(labels)}
+        middle = {(labels[i], labels[j]): labels[k] for i, j, k in data["middle"]}
+        return cls(rank, decode(data["up_out"]), decode(data["up_in"]), middle)
+
+
+def _from_json(x):
+    # JSON has no tuples: ids like (row, col) come back as lists
+    if isinstance(x, list):
+        return tuple(_from_json(y) for y in x)
+    return x
+
+
+class _UpwardSearch:
+    """One side of a CH query: Dijkstra on (distance, edges) pairs over one of the upward graphs.
+
+    down is the other upward graph, i.e. the edges into a vertex from higher ranked ones
+    in this search's direction. If one of those gives u a better pair than the one it
+    was settled with, u can't be on the best up-down path, so its edges are not relaxed
+    ("stall on demand"). That keeps the searches from wandering far up the hierarchy.
+    """
+
+    def __init__(self, adj, down, source):
+        self.adj = adj
+        self.down = down
+        self.labels = {source: (0.0, 0)}
+        self.parents = {source: None}
+        self.done = {}
+        self.Q = MinPriorityQueue()
+        self.Q.insert(source, (0.0, 0))
+
+    def top(self):
+        if not len(self.Q):
+            return (inf, inf)
+        return self.Q.minimum()[1]
+
+    def step(self):
+        u, label = self.Q.extract_min()
+        self.done[u] = label
+        for w, pair in self.down.get(u, {}).items():
+            if w in self.labels and _add_pair(self.labels[w], pair) < label:
+                return u, label
+        for v, pair in self.adj.get(u, {}).items():
+            if v in self.done:
+                continue
+            new = _add_pair(label, pair)
+            if v not in self.labels:
+                self.labels[v] = new
+                self.parents[v] = u
+                self.Q.insert(v, new)
+            elif new < self.labels[v]:
+                self.labels[v] = new
+                self.parents[v] = u
+                self.Q.decrease_key(v, new)
+        return u, label
+
+    def path_to(self, v):
+        path = []
+        while v is not None:
+            path.append(v)
+            v = self.parents[v]
+        path.reverse()
+        return path
+
+
+class _Contractor:
+    """The preprocessing state: the graph of not-yet-contracted vertices (with shortcuts)."""
+
+    def __init__(self, out_adj, in_adj, witness_limit):
+        self.out_adj = out_adj
+        self.in_adj = in_adj
+        self.witness_limit = witness_limit
+        self.contracted_neighbors = {v: 0 for v in out_adj}
+        self.shortcut_estimate = {}
+
+    def run(self):
+        rank = {}
+        up_out = {}
+        up_in = {}
+        middle = {}
+
+        for v in self.out_adj:
+            self._estimate(v)
+        priority = {v: self._priority(v) for v in self.out_adj}
+        heap = [(p, i, v) for i, (v, p) in enumerate(priority.items())]
+        heapq.heapify(heap)
+        counter = len(heap)
+        stale = set()
+        while heap:
+            p, _, v = heapq.heappop(heap)
+            if v in rank or p != priority[v]:
+                continue  # an older heap entry
+            if v in stale:
+                # contract it only if the fresh priority still beats the next one
+                stale.discard(v)
+                self._estimate(v)
+                priority[v] = self._priority(v)
+                if heap and priority[v] > heap[0][0]:
+                    heapq.heappush(heap, (priority[v], counter, v))
+                    counter += 1
+                    continue
+
+            rank[v] = len(rank)
+            # the remaining edges of v all go to higher ranked vertices
+            up_out[v] = self.out_adj[v]
+            up_in[v] = self.in_adj[v]
+            for u, w, pair in self._shortcuts(v, CONTRACT_WITNESS_HOPS):
+                if self._add_edge(u, w, pair):
+                    middle[(u, w)] = v
+            for w in self.out_adj[v]:
+                del self.in_adj[w][v]
+            for u in self.in_adj[v]:
+                del self.out_adj[u][v]
+            neighbors = set(self.out_adj[v]) | set(self.in_adj[v])
+            del self.out_adj[v]
+            del self.in_adj[v]
+
+            # Only the neighbours of v can have a different priority now. Their degree
+            # and contracted neighbour count are cheap to keep exact. Redoing the
+            # shortcut estimate of every neighbour would cost about V * degree^2 per
+            # contraction on a dense graph, so there it waits until x reaches the top.
+            for x in neighbors:
+                self.contracted_neighbors[x] += 1
+                if len(self.in_adj[x]) * len(self.out_adj[x]) <= EAGER_ESTIMATE_PAIRS:
+                    self._estimate(x)
+                else:
+                    stale.add(x)
+                priority[x] = self._priority(x)
+                heapq.heappush(heap, (priority[x], counter, x))
+                counter += 1
+        return rank, up_out, up_in, middle
+
+    def _add_edge(self, u, w, pair):
+        # keeps the better of the new shortcut and an edge u -> w already there
+        current = self.out_adj[u].get(w)
+        if current is not None and current <= pair:
+            return False
+        self.out_adj[u][w] = pair
+        self.in_adj[w][u] = pair
+        return True
+
+    def _estimate(self, v):
+        # Uses shorter witness searches than contraction, so it may overcount
+        # shortcuts, which only makes the order a little worse.
+        self.shortcut_estimate[v] = len(self._shortcuts(v, PRIORITY_WITNESS_HOPS))
+
+    def _priority(self, v):
+        # edge difference (weighted double), plus a term that spreads contraction evenly
+        # over the graph
+        removed = len(self.out_adj[v]) + len(self.in_adj[v])
+        return 2 * (self.shortcut_estimate[v] - removed) + self.contracted_neighbors[v]
+
+    def _shortcuts(self, v, max_hops):
+        """Shortcuts (u, w, pair) that contracting v would need."""
+        needed = []
+        outs = list(self.out_adj[v].items())
+        for u, (d, h) in self.in_adj[v].items():
+            # an edge u -> w that is already at least as good is a witness by itself
+            direct = self.out_adj[u]
+            targets = {}
+            for w, (weight, edges) in outs:
+                via = (d + weight, h + edges)
+                if w != u and direct.get(w, (inf, inf)) > via:
+                    targets[w] = via
+            if not targets:
+                continue
+            # the two hop check settles most pairs cheaply, the search does the rest
+            missing = self._witness_two_hops(u, v, targets)
+            if missing and max_hops > 2:
+                missing = self._witness(u, v, missing, max_hops)
+            for w, via in missing.items():
+                needed.append((u, w, via))
+        return needed
+
+    def _witness_two_hops(self, u, v, targets):
+        """_witness for max_hops=2 without a heap: tries every path u -> x -> w that
+        avoids v (the direct edges were already checked by _shortcuts)."""
+        missing = dict(targets)
+        limit = max(targets.values())
+        for x, (d, h) in self.out_adj[u].items():
+            if x == v or (d, h) > limit:
+                continue
+            out_x = self.out_adj[x]
+            for w, via in list(missing.items()):
+                pair = out_x.get(w)
+                if pair is not None and (d + pair[0], h + pair[1]) <= via:
+                    del missing[w]
+            if not missing:
+                break
+        return missing
+
+    def _witness(self, u, v, targets, max_hops):
+        """Dijkstra from u that skips v and follows at most max_hops edges. Labels worse
+        than every target cost are not kept, and it stops once every target is settled
+        or witness_limit vertices are. Returns {w: pair} for the targets it found no
+        path to (avoiding v) that is at least as good as their pair."""
+        limit = max(targets.values())
+        labels = {u: (0.0, 0)}
+        done = set()
+        heap = [((0.0, 0), 0, u)]
+        remaining = len(targets)
+        while heap and len(done) < self.witness_limit and remaining:
+            label, hops, x = heapq.heappop(heap)
+            if x in done:
+                continue
+            done.add(x)
+            if x in targets:
+                remaining -= 1
+            if hops == max_hops:
+                continue
+            d, h = label
+            for y, (weight, edges) in self.out_adj[x].items():
+                # no "y in done" test needed: a settled y already has a label <= new
+                new = (d + weight, h + edges)
+                if y != v and new <= limit and new < labels.get(y, (inf, inf)):
+                    labels[y] = new
+                    heapq.heappush(heap, (new, hops + 1, y))
+        return {w: via for w, via in targets.items() if labels.get(w, (inf, inf)) > via}
@@ -1,6 +1,26 @@
+import time
+from collections import deque
 from math import inf
 from priorityQue import MinPriorityQueue
 
+# dijkstra.py is the file that gets submitted, so it has to import on its own next to the
+# stock priorityQue.py. Everything else in this folder is imported only where it's needed,
+# and CSRGraph / FrozenGraph inputs are recognised by their attributes.
+if not hasattr(MinPriorityQueue, "__len__"):
+    class MinPriorityQueue(MinPriorityQueue):
+        def __len__(self):
+            return len(self.heap)
+
+try:
+    from priorityQue import make_queue
+except ImportError:
+    def make_queue(queue):
+        if callable(queue):
+            return queue()
+        if queue == "binary":
+            return MinPriorityQueue()
+        raise ValueError(f"queue={queue!r} needs the priorityQue.py from this folder")
+
 """
 In homework 6's coding assignment we have given you the code for Dijkstra from class (with some minor changes
 like more input validation). 
@@ -22,7 +42,8 @@ Used https://stackoverflow.com/questions/5292303/how-does-tuple-comparison-work-
 
 
 
-def dijkstra(G, s):
+def dijkstra(G, s, stats=None, lazy=False, queue=None, target=None, packed=False, scale=1,
+             compact=False):
     """
     This is an implmentation of the Dijkstra algorithm from class (see slide 18 from the 10_09 lecture)
 
@@ -31,12 +52,76 @@ def dijkstra(G, s):
     Returns:
         d: a dict mapping node -> shortest distance from s
         parents: dict mapping node -> parent in shortest-path tree (s has parent None)
+
+    G can also be a CSRGraph (see csr_graph.py). Then the search runs on int ids with
+    lists instead of dicts, and d/parents are mapped back to the original labels.
+
+    If stats is a dict it gets filled in with
+        stats["phases"]: seconds spent in weight_validation, queue_init and main_loop
+        stats["counters"]: vertices_settled, edges_scanned, decrease_key_calls, heap_swaps
+
+    lazy=True only puts a vertex in the priority queue when it is first reached,
+    instead of loading every vertex with priority (inf, inf) up front. The loop
+    stops when the queue is empty, so unreachable vertices never touch the heap
+    and are just reported with distance inf and parent None at the end.
+
+    queue picks the priority queue: "binary" (MinPriorityQueue, also what None
+    means), "dary4"/"dary8" (d-ary heaps), "pairing" (pairing heap), see QUEUES in
+    priorityQue.py. Anything callable that returns a new queue with insert,
+    extract_min, decrease_key and __len__ works too. CSRGraphs always use
+    CompactMinPriorityQueue.
+
+    queue="dial" replaces the heap with Dial's bucket queue (see _dijkstra_dial).
+    It needs every weight to be a whole number no bigger than DIAL_MAX_WEIGHT
+    and raises ValueError otherwise.
+
+    packed=True orders the queue by one int per vertex instead of (distance, edges)
+    tuples (see _dijkstra_packed). Every weight times scale has to be a whole number
+    (scale=1 for integer weights, scale=100 for weights with two decimals), otherwise
+    it raises ValueError. It always runs lazily and gives the same d and parents.
+
+    compact=True returns a ShortestPaths (see sp_result.py) holding the results in
+    typed arrays instead of two dicts; it still unpacks as d, parents. It runs the
+    CSRGraph engine, so a dict G is converted first (pass a CSRGraph to do that once).
+
+    G can be a FrozenGraph (see frozen_graph.py): its weights were checked when it was
+    built, so the negative weight scan is skipped.
+
+    If queue is left as None, a dict graph whose weights are all 0 or 1 is searched
+    with 0-1 BFS instead (see _dijkstra_01): same d and parents, O(V + E), no heap.
+    Naming a queue, "binary" included, always runs that queue.
+
+    target=t stops the search as soon as t is taken out of the queue (this implies
+    lazy=True). d and parents then only contain the vertices settled so far, which
+    always includes t if it is reachable; path_to(parents, t) gives the s -> t path.
     """
+    if target is not None:
+        lazy = True
+    if compact and not _is_csr(G):
+        from csr_graph import CSRGraph
+        G = CSRGraph(G)
+    if _is_csr(G):
+        if queue not in (None, "binary"):
+            raise ValueError("queue= only applies to dict graphs, CSRGraphs use CompactMinPriorityQueue")
+        return _dijkstra_csr(G, s, stats, lazy, target, compact)
+    if queue == "dial":
+        return _dijkstra_dial(G, s, stats, target)
+    if queue is None:
+        queue = "binary"
+        if not packed:
+            t0 = time.perf_counter()
+            if _zero_one_weights(G):
+                return _dijkstra_01(G, s, stats, target, t0)
+    if packed:
+        return _dijkstra_packed(G, s, stats, queue, target, scale)
+    if lazy:
+        return _dijkstra_lazy(G, s, stats, queue, target)
+
+    t0 = time.perf_counter()
     # We won't give you any graphs with negative edge weights, but here is how you could implement it
-    for u, neighbors in G.items():
-        for v, weight in neighbors.items():
-            if weight < 0:
-                raise ValueError("Dijkstra requires non-negative edge weights; found negative weight")
+    _check_weights(G)
+
+    t1 = time.perf_counter()
 
     # Collect all vertices (include isolated / sink nodes that might only appear as neighbors)
     vertices = set(G.keys())
@@ -50,7 +135,7 @@ def dijkstra(G, s):
     edgelen = {s:0}
 
     # your implementation from part 1
-    Q = MinPriorityQueue()
+    Q = make_queue(queue)
 
     # Initialize source
     pi[s] = 0.0
@@ -64,14 +149,18 @@ def dijkstra(G, s):
         edgelen[v] = inf
         parents.setdefault(v, None)
         Q.insert(v, (inf, inf))
+    t2 = time.perf_counter()
 
+    settled = scanned = decreases = 0
     # Main loop
-    while Q.heap:
+    while len(Q):
         u, (path_length_u, edge_length_u) = Q.extract_min()  # returns (element, (path priority, edge priority))
         d[u] = path_length_u
 
         if path_length_u == inf:
             continue
+        settled += 1
+        scanned += len(G[u])
 
         # For each neighbor v of u
         for v, weight_uv in G[u].items():
@@ -83,5 +172,583 @@ def dijkstra(G, s):
                 edgelen[v] = new_edges
                 parents[v] = u
                 Q.decrease_key(v, (new_length,new_edges))
+                decreases += 1
+
+    if stats is not None:
+        _fill_stats(stats, t0, t1, t2, time.perf_counter(), settled, scanned, decreases, getattr(Q, "swaps", 0))
+    return d, parents
+
+
+def _is_csr(G):
+    return hasattr(G, "roffsets")  # a CSRGraph (csr_graph.py)
+
+
+def _is_frozen(G):
+    return hasattr(G, "all_integer")  # a FrozenGraph (frozen_graph.py)
+
+
+def _check_weights(G):
+    if _is_frozen(G):
+        return  # checked when it was built
+    for u, neighbors in G.items():
+        for v, weight in neighbors.items():
+            if weight < 0:
+                raise ValueError("Dijkstra requires non-negative edge weights; found negative weight")
+
+
+def _dijkstra_lazy(G, s, stats=None, queue="binary", target=None):
+    """dijkstra(G, s, lazy=True): same relaxation and (distance, edge count)
+    priorities, but pi/edgelen only get entries for vertices we've reached."""
+    t0 = time.perf_counter()
+    _check_weights(G)
+    t1 = time.perf_counter()
+
+    pi = {s: 0.0}
+    edgelen = {s: 0}
+    parents = {s: None}
+    d = {}
+    Q = make_queue(queue)
+    Q.insert(s, (0.0, 0))
+    t2 = time.perf_counter()
+
+    settled = scanned = decreases = 0
+    while len(Q):
+        u, (path_length_u, edge_length_u) = Q.extract_min()
+        d[u] = path_length_u
+        if u == target:
+            break
+        neighbors = G.get(u, {})
+        settled += 1
+        scanned += len(neighbors)
+        for v, weight_uv in neighbors.items():
+            if v in d:
+                continue  # already final, weights are non-negative so it can't improve
+            new_length = path_length_u + weight_uv
+            new_edges = edge_length_u + 1
+            if v not in pi:
+                # first time we see v: this is the only place anything is inserted
+                pi[v] = new_length
+                edgelen[v] = new_edges
+                parents[v] = u
+                Q.insert(v, (new_length, new_edges))
+            elif (pi[v], edgelen[v]) > (new_length, new_edges):
+                pi[v] = new_length
+                edgelen[v] = new_edges
+                parents[v] = u
+                Q.decrease_key(v, (new_length, new_edges))
+                decreases += 1
+
+    if stats is not None:
+        _fill_stats(stats, t0, t1, t2, time.perf_counter(), settled, scanned, decreases, getattr(Q, "swaps", 0))
+    return _finish(G, d, parents, target)
+
+
+def _finish(G, d, parents, target):
+    """Results of the lazy engines: a full search reports every vertex of G (inf/None
+    if unreachable), a search with a target only the vertices it settled."""
+    if target is not None:
+        return d, {v: parents[v] for v in d}
+    for v in G:
+        if v not in d:
+            d[v] = inf
+            parents[v] = None
+    return d, parents
+
+
+def path_to(parents, t):
+    """The path [s, ..., t] read off a parents dict, or [] if t was not reached."""
+    if t not in parents:
+        return []
+    path = [t]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+def dijkstra_iter(G, s, max_distance=None, max_hops=None, max_settled=None, queue="binary"):
+    """Yield (v, distance, hops, parent) for each vertex in the order dijkstra settles
+    it, i.e. by (distance, edge count). hops and parent describe the same fewest-edges
+    shortest path tree dijkstra returns.
+
+    The cut-offs make isochrone style queries cheap:
+        max_distance: only vertices with distance <= max_distance. Labels above it never
+                      go into the queue, and the search ends at the first one popped.
+        max_hops:     only vertices whose path in the tree has <= max_hops edges.
+        max_settled:  stop after yielding this many vertices (0 yields nothing).
+    Weights are checked as edges are scanned instead of all up front, so the work done
+    depends on the part of the graph that gets explored, not on the size of G.
+
+    max_hops can't just stop expanding at depth max_hops: a vertex first reached in
+    few edges may have a shorter path with more edges, and then it isn't within the
+    bound. So vertices past the bound are still settled (silently) and relaxed, but
+    their paths only get longer in edges, and the search ends when the queue holds
+    nothing that is still within max_hops.
+    """
+    if max_settled is not None and max_settled <= 0:
+        return
+    pi = {s: 0.0}
+    edgelen = {s: 0}
+    parents = {s: None}
+    done = set()
+    Q = make_queue(queue)
+    Q.insert(s, (0.0, 0))
+    inside = 1  # queued vertices whose current label is within max_hops
+    count = 0
+
+    def within(h):
+        return max_hops is None or h <= max_hops
+
+    while len(Q) and inside:
+        u, (path_length_u, edge_length_u) = Q.extract_min()
+        if max_distance is not None and path_length_u > max_distance:
+            return
+        done.add(u)
+        if within(edge_length_u):
+            inside -= 1
+            yield u, path_length_u, edge_length_u, parents[u]
+            count += 1
+            if max_settled is not None and count >= max_settled:
+                return
+        for v, weight_uv in G.get(u, {}).items():
+            if weight_uv < 0:
+                raise ValueError("Dijkstra requires non-negative edge weights; found negative weight")
+            if v in done:
+                continue
+            new_length = path_length_u + weight_uv
+            new_edges = edge_length_u + 1
+            if max_distance is not None and new_length > max_distance:
+                continue
+            if v not in pi:
+                Q.insert(v, (new_length, new_edges))
+            elif (pi[v], edgelen[v]) > (new_length, new_edges):
+                Q.decrease_key(v, (new_length, new_edges))
+                inside -= within(edgelen[v])
+            else:
+                continue
+            inside += within(new_edges)
+            pi[v] = new_length
+            edgelen[v] = new_edges
+            parents[v] = u
+
+
+def reverse_graph(G):
+    """G with every edge flipped (weights kept), including sink-only vertices as keys."""
+    R = {u: {} for u in G}
+    for u, neighbors in G.items():
+        for v, weight in neighbors.items():
+            R.setdefault(v, {})[u] = weight
+    return R
+
+
+def bidirectional_dijkstra(G, s, t, G_rev=None):
+    """Shortest s -> t path by searching forward from s in G and backward from t in
+    the reversed graph (pass G_rev = reverse_graph(G) to reuse it between calls).
+
+    Returns (distance, path) with path = [s, ..., t], or (inf, []) if t can't be reached.
+
+    Both searches use the same (distance, edge count) priorities as dijkstra, i.e. they
+    compare paths lexicographically by total weight and then by number of edges. That
+    order is compatible with adding paths together, so the usual stopping rule works on
+    the pairs: every time an edge joins the two searches we remember the best total
+    (mu), and we stop once top of forward queue + top of backward queue >= mu.
+    The path we end with is therefore shortest and, among shortest, has the fewest edges.
+    """
+    if s == t:
+        return 0.0, [s]
+    _check_weights(G)
+    if G_rev is None:
+        G_rev = reverse_graph(G)
+
+    graphs = (G, G_rev)
+    labels = ({s: (0.0, 0)}, {t: (0.0, 0)})
+    parents = ({s: None}, {t: None})
+    done = (set(), set())
+    queues = (MinPriorityQueue(), MinPriorityQueue())
+    queues[0].insert(s, (0.0, 0))
+    queues[1].insert(t, (0.0, 0))
+    mu = (inf, inf)
+    meet = None
+
+    while len(queues[0]) and len(queues[1]):
+        top_f = queues[0].minimum()[1]
+        top_b = queues[1].minimum()[1]
+        if (top_f[0] + top_b[0], top_f[1] + top_b[1]) >= mu:
+            break
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        other = 1 - side
+        u, (du, hu) = queues[side].extract_min()
+        done[side].add(u)
+        for v, weight in graphs[side].get(u, {}).items():
+            new = (du + weight, hu + 1)
+            if v in labels[other]:
+                dv, hv = labels[other][v]
+                total = (new[0] + dv, new[1] + hv)
+                if total < mu:
+                    mu = total
+                    meet = (u, v) if side == 0 else (v, u)  # as an edge of G
+            if v in done[side]:
+                continue
+            if v not in labels[side]:
+                labels[side][v] = new
+                parents[side][v] = u
+                queues[side].insert(v, new)
+            elif new < labels[side][v]:
+                labels[side][v] = new
+                parents[side][v] = u
+                queues[side].decrease_key(v, new)
+
+    if meet is None:
+        return inf, []
+    a, b = meet
+    path = path_to(parents[0], a)
+    while b is not None:
+        path.append(b)
+        b = parents[1][b]
+    # add up the weights from s like dijkstra does. With whole-number weights that is
+    # exactly dijkstra's distance; with fractional ones a tied path summed in another
+    # order can differ from it in the last bits (0.9000000000000001 vs 0.8999999999999999)
+    distance = 0.0
+    for x, y in zip(path, path[1:]):
+        distance += G[x][y]
+    return distance, path
+
+
+def _packing_base(G, scale):
+    """Check that every weight * scale is a whole number and return a number bigger
+    than the edge count of any path _dijkstra_packed looks at (V + 1 would do; len(G)
+    + E + 1 is at least that and needs no set of vertices)."""
+    if _is_frozen(G) and scale == 1 and G.all_integer:
+        return G.num_vertices + 1
+    num_edges = 0
+    for neighbors in G.values():
+        num_edges += len(neighbors)
+        for weight in neighbors.values():
+            if weight < 0:
+                raise ValueError("Dijkstra requires non-negative edge weights; found negative weight")
+            if scale == 1:
+                if weight % 1:
+                    raise ValueError(f"packed=True needs whole number weights (or a scale); found {weight}")
+                continue
+            scaled = weight * scale
+            # decimal weights like 0.3 * 10 are a hair off in floating point
+            if abs(scaled - round(scaled)) > 1e-9 * max(1.0, abs(scaled)):
+                raise ValueError(f"packed=True needs weight * scale to be a whole number; found {weight} with scale={scale}")
+    return len(G) + num_edges + 1
+
+
+def _dijkstra_packed(G, s, stats=None, queue="binary", target=None, scale=1):
+    """dijkstra(G, s, packed=True): the lazy engine with int priorities.
+
+    With D = distance * scale (a whole number) and H bigger than any edge count,
+    key = D * H + edges orders vertices exactly like the (distance, edges) tuples:
+    a smaller D always wins because edges < H, and equal D falls through to edges.
+    Relaxing u -> v is then just key[u] + weight * scale * H + 1, so the loop builds
+    no tuples and the heap compares plain ints.
+
+    The key only decides the order. d[v] is d[parent] + l(parent, v) added up in
+    floats when v is settled, the same sum dijkstra reports.
+    """
+    t0 = time.perf_counter()
+    H = _packing_base(G, scale)
+    t1 = time.perf_counter()
+
+    key = {s: 0}
+    parents = {s: None}
+    d = {}
+    Q = make_queue(queue)
+    Q.insert(s, 0)
+    t2 = time.perf_counter()
+
+    to_int = int if scale == 1 else (lambda weight: round(weight * scale))
+    settled = scanned = decreases = 0
+    while len(Q):
+        u, key_u = Q.extract_min()
+        p = parents[u]
+        d[u] = 0.0 if p is None else d[p] + G[p][u]
+        if u == target:
+            break
+        neighbors = G.get(u, {})
+        settled += 1
+        scanned += len(neighbors)
+        for v, weight_uv in neighbors.items():
+            if v in d:
+                continue
+            new_key = key_u + to_int(weight_uv) * H + 1
+            old_key = key.get(v)
+            if old_key is None:
+                key[v] = new_key
+                parents[v] = u
+                Q.insert(v, new_key)
+            elif new_key < old_key:
+                key[v] = new_key
+                parents[v] = u
+                Q.decrease_key(v, new_key)
+                decreases += 1
+
+    if stats is not None:
+        _fill_stats(stats, t0, t1, t2, time.perf_counter(), settled, scanned, decreases, getattr(Q, "swaps", 0))
+    return _finish(G, d, parents, target)
+
+
+def _zero_one_weights(G):
+    """True if every weight is 0 or 1. Stops at the first other weight, so for most
+    graphs this costs next to nothing (negative weights are left to the engine that
+    runs next); when it does go through every edge it has also checked them all."""
+    if _is_frozen(G):
+        return G.max_weight is None or (G.all_integer and G.max_weight <= 1)
+    for neighbors in G.values():
+        for weight in neighbors.values():
+            if weight != 0 and weight != 1:
+                return False
+    return True
+
+
+def _dijkstra_01(G, s, stats=None, target=None, t0=None):
+    """dijkstra for graphs with only 0 and 1 weights: 0-1 BFS, ordered by (distance, edges).
+
+    Plain 0-1 BFS puts 0-edge neighbours at the front of a deque and 1-edge ones at the
+    back. That gets the distances right but not the edge counts, so here the vertices
+    at distance D come from two lists that are each already sorted by edge count:
+        cur:  reached over a 1-edge while distance D - 1 was processed; that happened in
+              edge count order, so these have non-decreasing counts too
+        zero: reached over a 0-edge while distance D is processed, same argument
+    Taking the smaller head of the two each time visits distance D in (distance, edges)
+    order, like the heap does, and anything found over a 1-edge goes into the list for
+    D + 1. It is _dijkstra_dial with C = 1 minus the sort, so every step is O(1).
+    Stale entries (the vertex got a better label later) are skipped.
+    """
+    if t0 is None:
+        t0 = time.perf_counter()
+    t1 = time.perf_counter()  # _zero_one_weights already checked every weight
+
+    pi = {s: 0}
+    edgelen = {s: 0}
+    parents = {s: None}
+    d = {}
+    cur = [(0, s)]
+    t2 = time.perf_counter()
+
+    settled = scanned = decreases = 0
+    D = 0
+    while cur:
+        nxt = []
+        zero = deque()
+        i = 0
+        while i < len(cur) or zero:
+            if zero and (i == len(cur) or zero[0][0] < cur[i][0]):
+                hops, u = zero.popleft()
+            else:
+                hops, u = cur[i]
+                i += 1
+            if u in d or pi[u] != D or edgelen[u] != hops:
+                continue  # stale entry
+            d[u] = float(D)
+            if u == target:
+                nxt = []
+                break
+            neighbors = G.get(u, {})
+            settled += 1
+            scanned += len(neighbors)
+            for v, weight_uv in neighbors.items():
+                if v in d:
+                    continue
+                new_length = D + 1 if weight_uv else D
+                new_edges = hops + 1
+                if v not in pi or new_length < pi[v] or (new_length == pi[v] and new_edges < edgelen[v]):
+                    if v in pi:
+                        decreases += 1
+                    pi[v] = new_length
+                    edgelen[v] = new_edges
+                    parents[v] = u
+                    if new_length == D:
+                        zero.append((new_edges, v))
+                    else:
+                        nxt.append((new_edges, v))
+        cur = nxt
+        D += 1
+
+    if stats is not None:
+        _fill_stats(stats, t0, t1, t2, time.perf_counter(), settled, scanned, decreases, 0)
+    return _finish(G, d, parents, target)
+
+
+# Dial's algorithm keeps max weight + 1 buckets, so don't let that get silly
+DIAL_MAX_WEIGHT = 1 << 16
+
+
+def _dijkstra_dial(G, s, stats=None, target=None):
+    """dijkstra(G, s, queue="dial") for whole-number weights up to DIAL_MAX_WEIGHT.
+
+    Dial's algorithm: bucket[D % (C + 1)] holds the vertices with tentative distance D
+    (C = max weight). We walk D = 0, 1, 2, ... and an edge of weight w from a vertex
+    in bucket D goes into bucket D + w <= D + C, so C + 1 buckets in a circle are enough
+    and every queue operation is O(1).
+
+    The tie-break still needs "fewest edges first" inside one distance. When bucket D
+    is opened its entries (hops, v) are sorted by hops. Vertices found through 0-weight
+    edges while processing D have hops one more than the vertex that found them,
+    so they go in a FIFO that is also sorted by hops. Taking the smaller head of the
+    two each time processes bucket D in (distance, edges) order, exactly like the
+    tuple priorities in the heap version.
+    Entries are never removed from buckets: a stale entry is skipped when it comes up.
+    """
+    t0 = time.perf_counter()
+    C = 0
+    if _is_frozen(G):
+        # already scanned when G was built
+        if not G.all_integer:
+            raise ValueError(f"queue='dial' needs whole number weights <= {DIAL_MAX_WEIGHT}; found a fractional weight")
+        if (G.max_weight or 0) > DIAL_MAX_WEIGHT:
+            raise ValueError(f"queue='dial' needs whole number weights <= {DIAL_MAX_WEIGHT}; found {G.max_weight}")
+        C = int(G.max_weight or 0)
+    else:
+        for u, neighbors in G.items():
+            for v, weight in neighbors.items():
+                if weight < 0:
+                    raise ValueError("Dijkstra requires non-negative edge weights; found negative weight")
+                if weight != int(weight) or weight > DIAL_MAX_WEIGHT:
+                    raise ValueError(f"queue='dial' needs whole number weights <= {DIAL_MAX_WEIGHT}; found {weight}")
+                if weight > C:
+                    C = int(weight)
+    t1 = time.perf_counter()
+
+    nb = C + 1
+    buckets = [[] for _ in range(nb)]
+    pi = {s: 0}
+    edgelen = {s: 0}
+    parents = {s: None}
+    d = {}
+    buckets[0].append((0, s))
+    pending = 1  # entries sitting in buckets, stale ones included
+    t2 = time.perf_counter()
+
+    settled = scanned = decreases = 0
+    D = 0
+    while pending:
+        bucket = buckets[D % nb]
+        if not bucket:
+            D += 1
+            continue
+        buckets[D % nb] = []
+        pending -= len(bucket)
+        bucket.sort(key=lambda entry: entry[0])
+        zero = deque()  # (hops, v) found through 0-weight edges at this distance
+        i = 0
+        while i < len(bucket) or zero:
+            if zero and (i == len(bucket) or zero[0][0] < bucket[i][0]):
+                hops, u = zero.popleft()
+            else:
+                hops, u = bucket[i]
+                i += 1
+            if u in d or pi[u] != D or edgelen[u] != hops:
+                continue  # stale entry
+            d[u] = float(D)
+            if u == target:
+                pending = 0
+                break
+            neighbors = G.get(u, {})
+            settled += 1
+            scanned += len(neighbors)
+            for v, weight_uv in neighbors.items():
+                if v in d:
+                    continue
+                new_length = D + int(weight_uv)
+                new_edges = hops + 1
+                if v not in pi or new_length < pi[v] or (new_length == pi[v] and new_edges < edgelen[v]):
+                    if v in pi:
+                        decreases += 1
+                    pi[v] = new_length
+                    edgelen[v] = new_edges
+                    parents[v] = u
+                    if new_length == D:
+                        zero.append((new_edges, v))
+                    else:
+                        buckets[new_length % nb].append((new_edges, v))
+                        pending += 1
+        D += 1
+
+    if stats is not None:
+        _fill_stats(stats, t0, t1, t2, time.perf_counter(), settled, scanned, decreases, 0)
+    return _finish(G, d, parents, target)
+
+
+def _fill_stats(stats, t0, t1, t2, t3, settled, scanned, decreases, swaps):
+    stats["phases"] = {"weight_validation": t1 - t0, "queue_init": t2 - t1, "main_loop": t3 - t2}
+    stats["counters"] = {
+        "vertices_settled": settled,
+        "edges_scanned": scanned,
+        "decrease_key_calls": decreases,
+        "heap_swaps": swaps,
+    }
+
+
+def _dijkstra_csr(G, s, stats=None, lazy=False, target=None, compact=False):
+    """The same algorithm as dijkstra() but on a CSRGraph, so every per-node table
+    is a list indexed by int id. The queue is a CompactMinPriorityQueue: int handles,
+    distance as the key and edge count as the tie, so the loop builds no tuples.
+    With lazy=True a vertex goes into the heap when pi[v] first drops below inf.
+    compact=True hands the lists to a ShortestPaths instead of building dicts."""
+    t0 = time.perf_counter()
+    for w in G.weights:
+        if w < 0:
+            raise ValueError("Dijkstra requires non-negative edge weights; found negative weight")
+
+    t1 = time.perf_counter()
+
+    n = len(G)
+    offsets, targets, weights = G.offsets, G.targets, G.weights
+    s_id = G.ids[s]
+    t_id = G.ids.get(target, -1)
+    pi = [inf] * n
+    edgelen = [inf] * n
+    parent = [-1] * n
+    dist = [inf] * n
+
+    from priorityQue import CompactMinPriorityQueue
+    Q = CompactMinPriorityQueue(n)
+    pi[s_id] = 0.0
+    edgelen[s_id] = 0
+    if lazy:
+        Q.insert(s_id, 0.0, 0)
+    else:
+        Q.insert_many(range(n), pi, edgelen)  # O(n) heapify instead of n inserts
+    t2 = time.perf_counter()
+
+    settled = scanned = decreases = 0
+    while Q.heap:
+        u = Q.extract_min()
+        path_length_u = pi[u]
+        dist[u] = path_length_u
+        if path_length_u == inf:
+            continue
+        if u == t_id:
+            break
+        edge_length_u = edgelen[u]
+        settled += 1
+        scanned += offsets[u + 1] - offsets[u]
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_length = path_length_u + weights[e]
+            new_edges = edge_length_u + 1
+            pv = pi[v]
+            if new_length < pv or (new_length == pv and new_edges < edgelen[v]):
+                pi[v] = new_length
+                edgelen[v] = new_edges
+                parent[v] = u
+                if lazy and pv == inf:
+                    Q.insert(v, new_length, new_edges)
+                else:
+                    Q.decrease_key(v, new_length, new_edges)
+                    decreases += 1
 
+    if stats is not None:
+        _fill_stats(stats, t0, t1, t2, time.perf_counter(), settled, scanned, decreases, getattr(Q, "swaps", 0))
+    if compact:
+        from sp_result import ShortestPaths
+        return ShortestPaths(G, s, dist, parent, edgelen, complete=target is None)
+    labels = G.labels
+    keep = range(n) if target is None else [v for v in range(n) if dist[v] < inf]
+    d = {labels[v]: dist[v] for v in keep}
+    parents = {labels[v]: (labels[parent[v]] if parent[v] >= 0 else None) for v in keep}
     return d, parents
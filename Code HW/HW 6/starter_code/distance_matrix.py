@@ -0,0 +1,73 @@
+"""
+Many-to-many shortest path distances: one dijkstra per source, spread over processes.
+
+    for s, row in distance_matrix(G, sources, targets, workers=4):
+        ...   # row[t] = distance from s to t (inf if unreachable)
+
+distance_matrix is a generator. Rows come back in the order they finish (not the
+order of sources), and only about 2 * workers searches are in flight at a time, so
+memory stays bounded even when the whole table would not fit. Write each row out
+(or reduce it) as it arrives instead of collecting them all.
+
+The graph is sent to every worker process once, through the pool initializer,
+instead of being pickled again for each source.
+
+Note: with the "spawn" start method (Windows, macOS) call this from under an
+`if __name__ == "__main__":` guard.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from math import inf
+
+from dijkstra import dijkstra
+
+# Set in each worker process by _init_worker
+_graph = None
+_targets = None
+
+
+def _init_worker(G, targets):
+    global _graph, _targets
+    _graph = G
+    _targets = targets
+
+
+def _row(G, targets, s):
+    d, _ = dijkstra(G, s, lazy=True)
+    if targets is None:
+        return s, d
+    return s, {t: d.get(t, inf) for t in targets}
+
+
+def _worker_row(s):
+    return _row(_graph, _targets, s)
+
+
+def distance_matrix(G, sources, targets=None, workers=None):
+    """Yield (s, row) for every s in sources, row mapping each target to d(s, target).
+
+    targets: the columns to keep (default: every vertex, i.e. the full d of dijkstra).
+    workers: number of processes; None or 1 runs the searches in this process.
+    """
+    if targets is not None:
+        targets = list(targets)
+    if not workers or workers == 1:
+        for s in sources:
+            yield _row(G, targets, s)
+        return
+
+    max_pending = 2 * workers
+    sources = iter(sources)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(G, targets)) as pool:
+        pending = set()
+        for s in sources:
+            pending.add(pool.submit(_worker_row, s))
+            if len(pending) >= max_pending:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                for s in sources:  # top up with (at most) one new source
+                    pending.add(pool.submit(_worker_row, s))
+                    break
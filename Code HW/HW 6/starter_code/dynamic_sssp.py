@@ -0,0 +1,178 @@
+"""
+Repairing a dijkstra result after a few edges change, instead of rerunning it.
+
+    d, parents = dijkstra(G, s)
+    G["a"]["b"] = 7.0          # change a weight
+    del G["b"]["c"]            # delete an edge
+    G["x"]["y"] = 1.0          # insert an edge
+    repair_shortest_paths(G, s, d, parents, [("a", "b"), ("b", "c"), ("x", "y")])
+
+This follows Ramalingam and Reps. Labels are the same (distance, edge count) pairs
+dijkstra uses as priorities, so the repaired tree still has the fewest edges among
+shortest paths.
+
+1. Edges that got worse (deleted, or heavier) only matter if they are tree edges
+   (parents[v] == u). Everything in the subtree under such a v has lost its path and
+   is "affected". Their labels are reset, and each one gets a first guess from its
+   in-neighbours that are not affected.
+2. Edges that got better (inserted, or lighter) are relaxed once.
+3. A Dijkstra run that starts with only the vertices touched by 1 and 2 in the heap
+   spreads the new labels. It only goes as far as labels actually change.
+
+Finding the in-neighbours of affected vertices needs the reversed graph. Building it
+is a full pass over the edges (seconds on a graph with a million edges), so for
+repeated repairs keep one around: either pass G_rev = reverse_graph(G) and make every
+change to it too (G_rev[v][u] = w next to G[u][v] = w, del G_rev[v][u] next to
+del G[u][v]), or let DynamicShortestPaths do that bookkeeping:
+
+    sp = DynamicShortestPaths(G, s)
+    sp.update([("a", "b", 7.0), ("b", "c", None), ("x", "y", 1.0)])   # None deletes
+    sp.d, sp.parents
+"""
+
+from math import inf
+
+from dijkstra import dijkstra, reverse_graph
+from priorityQue import MinPriorityQueue
+
+
+class DynamicShortestPaths:
+    """dijkstra(G, s) kept up to date through edge changes. Holds the reversed graph
+    so each update only costs the repair itself."""
+
+    def __init__(self, G, s):
+        self.G = G
+        self.s = s
+        self.G_rev = reverse_graph(G)
+        self.d, self.parents = dijkstra(G, s)
+
+    def update(self, changes):
+        """changes: (u, v, weight) triples; weight None deletes the edge u -> v.
+        Applies them to G and repairs d and parents."""
+        changed_edges = []
+        for u, v, weight in changes:
+            if weight is None:
+                self.G.get(u, {}).pop(v, None)
+                self.G_rev.get(v, {}).pop(u, None)
+            else:
+                self.G.setdefault(u, {})[v] = weight
+                self.G.setdefault(v, {})
+                self.G_rev.setdefault(v, {})[u] = weight
+                self.G_rev.setdefault(u, {})
+            changed_edges.append((u, v))
+        repair_shortest_paths(self.G, self.s, self.d, self.parents, changed_edges, self.G_rev)
+        return self.d, self.parents
+
+
+def repair_shortest_paths(G, s, d, parents, changed_edges, G_rev=None):
+    """Update d and parents (in place, and returns them) so they equal dijkstra(G, s)
+    on the current G. changed_edges lists every (u, v) whose weight changed, was
+    inserted or was deleted since d/parents were computed. G must already be updated.
+    Without G_rev the reversed graph is rebuilt first, a full pass over the edges;
+    see the module docstring for keeping it between calls."""
+    if G_rev is None:
+        G_rev = reverse_graph(G)
+
+    # parents is left alone until the end so hop() always sees the old tree;
+    # new parents and edge counts of re-settled vertices go into these two dicts
+    new_parents = {}
+    new_hops = {}
+    hops = {s: 0}
+
+    def hop(v):
+        # edge count of v's old tree path, climbing parents until we hit a known value
+        chain = []
+        while v not in hops:
+            chain.append(v)
+            v = parents[v]
+        h = hops[v]
+        for x in reversed(chain):
+            h += 1
+            hops[x] = h
+        return h
+
+    def label(v):
+        dv = d.get(v, inf)
+        if dv == inf:
+            return (inf, inf)
+        if v in new_hops:
+            return (dv, new_hops[v])
+        return (dv, hop(v))
+
+    # 1. roots of subtrees whose tree path got worse
+    roots = []
+    for u, v in changed_edges:
+        if v == s or parents.get(v) != u:
+            continue
+        weight = G.get(u, {}).get(v)
+        if weight is None or d[u] + weight > d[v]:
+            roots.append(v)
+
+    affected = set()
+    todo = list(roots)
+    while todo:
+        x = todo.pop()
+        if x in affected:
+            continue
+        affected.add(x)
+        # children of x in the tree: parents[w] == x needs the edge x -> w (or it was
+        # deleted, in which case w is a root itself)
+        for w in G.get(x, {}):
+            if parents.get(w) == x and w not in affected:
+                todo.append(w)
+
+    pi = {}  # tentative labels of vertices waiting in the heap
+    Q = MinPriorityQueue()
+
+    def offer(v, new, u):
+        current = pi.get(v)
+        if current is None:
+            current = label(v)  # (inf, inf) for affected vertices until they are settled again
+        if new < current:
+            in_queue = v in pi
+            pi[v] = new
+            new_parents[v] = u
+            if in_queue:
+                Q.decrease_key(v, new)
+            else:
+                Q.insert(v, new)
+
+    for a in affected:
+        d[a] = inf
+    for a in affected:
+        for x, weight in G_rev.get(a, {}).items():
+            if x not in affected and d.get(x, inf) < inf:
+                dx, hx = label(x)
+                offer(a, (dx + weight, hx + 1), x)
+
+    # 2. edges that may have got better
+    for u, v in changed_edges:
+        weight = G.get(u, {}).get(v)
+        if weight is None or u in affected or d.get(u, inf) == inf:
+            continue
+        du, hu = label(u)
+        offer(v, (du + weight, hu + 1), u)
+
+    # 3. Dijkstra over the vertices whose labels change
+    while len(Q):
+        u, (du, hu) = Q.extract_min()
+        del pi[u]
+        d[u] = du
+        new_hops[u] = hu
+        for v, weight in G.get(u, {}).items():
+            offer(v, (du + weight, hu + 1), u)
+
+    for a in affected:
+        parents[a] = None  # stays None if a can't be reached any more
+    parents.update(new_parents)
+    # a vertex can only be new if it came with a changed edge; the full pass is only
+    # for vertices added to G without any edge
+    for u, v in changed_edges:
+        for x in (u, v):
+            d.setdefault(x, inf)
+            parents.setdefault(x, None)
+    if len(d) != len(G):
+        for v in G:
+            d.setdefault(v, inf)
+            parents.setdefault(v, None)
+    return d, parents
@@ -0,0 +1,66 @@
+"""
+A read-only graph that is checked once instead of on every dijkstra call.
+
+dijkstra(G, s) normally walks every edge first to make sure no weight is negative.
+That is wasted work when the same graph answers thousands of queries. FrozenGraph
+copies a dict-of-dicts graph, does that check once, and remembers what it saw:
+
+    G = FrozenGraph(graph_dict)          # raises ValueError on a negative weight
+    G.num_vertices, G.num_edges
+    G.min_weight, G.max_weight          # None if there are no edges
+    G.all_integer                       # every weight is a whole number
+    G.all_equal                         # every weight is the same
+
+dijkstra (and everything built on _check_weights) skips the scan for a FrozenGraph,
+and queue="dial" reads all_integer / max_weight instead of scanning. Callers can use the
+same fields to pick an algorithm, e.g. BFS-like searches when all_equal is set.
+
+G[u] is a read-only view, so the numbers can't go stale. To change the graph, build a
+new FrozenGraph from the changed dict. Vertices that only appear as a neighbour become
+keys with no out-edges, like in reverse_graph.
+"""
+
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+class FrozenGraph(Mapping):
+
+    def __init__(self, G):
+        adj = {u: dict(neighbors) for u, neighbors in G.items()}
+        num_edges = 0
+        min_weight = max_weight = None
+        all_integer = True
+        for u, neighbors in list(adj.items()):
+            for v, weight in neighbors.items():
+                if weight < 0:
+                    raise ValueError("Dijkstra requires non-negative edge weights; found negative weight")
+                num_edges += 1
+                if min_weight is None or weight < min_weight:
+                    min_weight = weight
+                if max_weight is None or weight > max_weight:
+                    max_weight = weight
+                if all_integer and not float(weight).is_integer():
+                    all_integer = False
+                adj.setdefault(v, {})
+
+        self._adj = {u: MappingProxyType(neighbors) for u, neighbors in adj.items()}
+        self.num_vertices = len(adj)
+        self.num_edges = num_edges
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        self.all_integer = all_integer
+        self.all_equal = min_weight == max_weight
+
+    def __getitem__(self, u):
+        return self._adj[u]
+
+    def __iter__(self):
+        return iter(self._adj)
+
+    def __len__(self):
+        return len(self._adj)
+
+    def __repr__(self):
+        return (f"FrozenGraph(num_vertices={self.num_vertices}, num_edges={self.num_edges}, "
+                f"min_weight={self.min_weight}, max_weight={self.max_weight})")
@@ -0,0 +1,151 @@
+"""
+A* with landmarks (ALT) for answering lots of s -> t shortest path queries on the same graph.
+
+Preprocessing: pick a few landmark vertices L and store, using the normal dijkstra,
+    dist_from[L][v] = d(L, v)     (dijkstra on G from L)
+    dist_to[L][v]   = d(v, L)     (dijkstra on the reversed graph from L)
+
+The triangle inequality then gives lower bounds on d(v, t) for any v, t:
+    d(v, t) >= d(L, t) - d(L, v)
+    d(v, t) >= d(v, L) - d(t, L)
+and h(v) = the biggest of these bounds is a consistent A* heuristic.
+
+A query is Dijkstra on the reduced weights l(u, v) - h(u) + h(v) >= 0, i.e. A* with
+priority (g(v) + h(v), edges). Every s -> t path has its weight shifted by the same
+h(t) - h(s), so the search still finds the shortest path with the fewest edges, just
+like dijkstra's (distance, edge count) priorities, while looking at far fewer vertices.
+
+The index can be saved to / loaded from a JSON file (inf is written as "inf", like the
+test files).
+"""
+
+import json
+from math import inf
+
+from dijkstra import dijkstra, reverse_graph, path_to
+from priorityQue import MinPriorityQueue
+
+
+class LandmarkIndex:
+
+    def __init__(self, landmarks, dist_from, dist_to):
+        self.landmarks = landmarks
+        self.dist_from = dist_from
+        self.dist_to = dist_to
+
+    @classmethod
+    def build(cls, G, k=8, first=None):
+        """Pick k landmarks by farthest-point selection and run the 2k dijkstras.
+
+        The first landmark is `first` (default: the first vertex of G). Each next one
+        is the vertex whose distance from the closest landmark so far is largest, with
+        vertices no landmark can reach counting as farthest, so the landmarks spread out.
+        """
+        R = reverse_graph(G)
+        vertices = list(R)  # includes vertices that only show up as neighbours
+        if not vertices:
+            return cls([], {}, {})
+        landmarks = []
+        dist_from = {}
+        dist_to = {}
+        closest = {v: inf for v in vertices}  # distance from the nearest landmark
+        candidate = first if first is not None else vertices[0]
+        for _ in range(min(k, len(vertices))):
+            L = candidate
+            landmarks.append(L)
+            dist_from[L], _ = dijkstra(G, L, lazy=True)
+            dist_to[L], _ = dijkstra(R, L, lazy=True)
+            for v in vertices:
+                closest[v] = min(closest[v], dist_from[L].get(v, inf))
+            candidate = max((v for v in vertices if v not in dist_from),
+                            key=lambda v: closest[v], default=None)
+            if candidate is None:
+                break
+        return cls(landmarks, dist_from, dist_to)
+
+    def lower_bound(self, v, t):
+        """Largest landmark lower bound on d(v, t); inf means t can't be reached from v."""
+        best = 0.0
+        for L in self.landmarks:
+            f, t_to = self.dist_from[L], self.dist_to[L]
+            lv, lt = f.get(v, inf), f.get(t, inf)
+            if lv < inf:
+                # L reaches v, so if L can't reach t then neither can v
+                best = max(best, lt - lv)
+            vl, tl = t_to.get(v, inf), t_to.get(t, inf)
+            if tl < inf:
+                # t reaches L, so if v can't reach L then v can't reach t either
+                best = max(best, vl - tl)
+        return best
+
+    def query(self, G, s, t):
+        """Shortest s -> t path in G as (distance, path), or (inf, []) if there is none.
+        Gives the same distance as dijkstra(G, s) and a path with the fewest edges
+        among the shortest ones."""
+        if s == t:
+            return 0.0, [s]
+        h = {}
+
+        def heuristic(v):
+            if v not in h:
+                h[v] = self.lower_bound(v, t)
+            return h[v]
+
+        if heuristic(s) == inf:
+            return inf, []
+        g = {s: 0.0}
+        edgelen = {s: 0}
+        parents = {s: None}
+        done = set()
+        Q = MinPriorityQueue()
+        Q.insert(s, (heuristic(s), 0))
+        while len(Q):
+            u, _ = Q.extract_min()
+            if u == t:
+                break
+            done.add(u)
+            for v, weight in G.get(u, {}).items():
+                if v in done:
+                    continue
+                hv = heuristic(v)
+                if hv == inf:
+                    continue  # t is not reachable through v
+                new_length = g[u] + weight
+                new_edges = edgelen[u] + 1
+                if v not in g:
+                    g[v] = new_length
+                    edgelen[v] = new_edges
+                    parents[v] = u
+                    Q.insert(v, (new_length + hv, new_edges))
+                elif (g[v], edgelen[v]) > (new_length, new_edges):
+                    g[v] = new_length
+                    edgelen[v] = new_edges
+                    parents[v] = u
+                    Q.decrease_key(v, (new_length + hv, new_edges))
+        if t not in g:
+            return inf, []
+        return g[t], path_to(parents, t)
+
+    def save(self, path):
+        def encode(table):
+            return {str(L): {str(v): ("inf" if x == inf else x) for v, x in row.items()}
+                    for L, row in table.items()}
+
+        with open(path, "w") as f:
+            json.dump({
+                "landmarks": [str(L) for L in self.landmarks],
+                "dist_from": encode(self.dist_from),
+                "dist_to": encode(self.dist_to),
+            }, f)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index written by save(). Node ids come back as strings, like the
+        graphs in the JSON test files."""
+        def decode(table):
+            return {L: {v: (inf if x == "inf" else x) for v, x in row.items()}
+                    for L, row in table.items()}
+
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(data["landmarks"], decode(data["dist_from"]), decode(data["dist_to"]))
@@ -2,6 +2,8 @@
 No task for you here! But if you want to look at an implmentation you can look here!
 """
 
+from array import array
+
 
 class MinPriorityQueue:
     """
@@ -25,6 +27,10 @@ class MinPriorityQueue:
     def __init__(self):
         self.heap = []
         self.position_map = {}
+        self.swaps = 0  # number of _swap calls, reported by dijkstra(..., stats=...)
+
+    def __len__(self):
+        return len(self.heap)
 
     def insert(self, element, priority):
         self.heap.append((element, priority))
@@ -92,6 +98,7 @@ class MinPriorityQueue:
     def _swap(self, i, j):
         if i == j:
             return
+        self.swaps += 1
         # Get the priority and elements from the heap at the two locations
         ei, pi = self.heap[i]
         ej, pj = self.heap[j]
@@ -103,3 +110,284 @@ class MinPriorityQueue:
         self.position_map[ei] = j
         self.position_map[ej] = i
 
+
+
+class DaryMinPriorityQueue(MinPriorityQueue):
+    """
+    The same PQ but every node has d children instead of 2: heap[d*i + 1] ... heap[d*i + d]
+    are the children of heap[i]. The tree is only log_d(n) deep, so decrease_key (which
+    swaps upwards) gets cheaper, and extract_min looks at d children per level instead.
+    Dijkstra does many more decrease_keys than extract_mins on dense graphs, so d = 4
+    is usually a good trade.
+    """
+
+    def __init__(self, d=4):
+        super().__init__()
+        self.d = d
+
+    def _find_parent_index_from_index(self, i):
+        return (i - 1) // self.d
+
+    def _push_swap_down(self, i):
+        heap = self.heap
+        n = len(heap)
+        while True:
+            first = self.d * i + 1
+            if first >= n:
+                break
+            smallest = i
+            for c in range(first, min(first + self.d, n)):
+                if heap[c][1] < heap[smallest][1]:
+                    smallest = c
+            if smallest == i:
+                break
+            self._swap(i, smallest)
+            i = smallest
+
+
+class _PairingNode:
+    __slots__ = ("element", "priority", "child", "sibling", "prev")
+
+    def __init__(self, element, priority):
+        self.element = element
+        self.priority = priority
+        self.child = None
+        self.sibling = None
+        self.prev = None  # parent if we are the first child, otherwise the previous sibling
+
+
+class PairingHeap:
+    """
+    A pairing heap with the same interface as MinPriorityQueue
+    (insert, extract_min, decrease_key, minimum, __len__).
+
+    The heap is a tree where every node has a lower priority than its children.
+    insert and decrease_key are O(1): they just link a one-node (or cut off) tree
+    with the root. extract_min removes the root and pairs up its children
+    left to right, then merges the pairs right to left (O(log n) amortized).
+    position_map maps element -> node like in MinPriorityQueue.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.position_map = {}
+        self.swaps = 0  # number of links, the closest thing to a heap swap here
+
+    def __len__(self):
+        return len(self.position_map)
+
+    def _link(self, a, b):
+        """Merge two roots, return the new root."""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        self.swaps += 1
+        if b.priority < a.priority:
+            a, b = b, a
+        # b becomes the first child of a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        a.sibling = None
+        a.prev = None
+        return a
+
+    def insert(self, element, priority):
+        node = _PairingNode(element, priority)
+        self.position_map[element] = node
+        self.root = self._link(self.root, node)
+
+    def minimum(self):
+        if self.root is None:
+            return None
+        return self.root.element, self.root.priority
+
+    def extract_min(self):
+        root = self.root
+        if root is None:
+            return None
+        del self.position_map[root.element]
+        # first pass: link children in pairs, left to right
+        pairs = []
+        node = root.child
+        while node is not None:
+            a = node
+            b = a.sibling
+            node = b.sibling if b is not None else None
+            a.sibling = a.prev = None
+            if b is not None:
+                b.sibling = b.prev = None
+            pairs.append(self._link(a, b))
+        # second pass: merge the pairs right to left
+        new_root = None
+        for tree in reversed(pairs):
+            new_root = self._link(tree, new_root)
+        self.root = new_root
+        return root.element, root.priority
+
+    def decrease_key(self, element, new_priority):
+        node = self.position_map.get(element)
+        if node is None or new_priority >= node.priority:
+            return
+        node.priority = new_priority
+        if node is self.root:
+            return
+        # cut node (with its subtree) out of the tree and link it with the root
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling is not None:
+            node.sibling.prev = node.prev
+        node.sibling = node.prev = None
+        self.root = self._link(self.root, node)
+
+
+# Names accepted by dijkstra(G, s, queue=...)
+QUEUES = {
+    "binary": MinPriorityQueue,
+    "dary4": lambda: DaryMinPriorityQueue(4),
+    "dary8": lambda: DaryMinPriorityQueue(8),
+    "pairing": PairingHeap,
+}
+
+
+def make_queue(queue):
+    """queue can be one of the names in QUEUES or anything that builds a new queue when called."""
+    if callable(queue):
+        return queue()
+    if queue not in QUEUES:
+        raise ValueError(f"unknown queue {queue!r}, expected one of {sorted(QUEUES)}")
+    return QUEUES[queue]()
+
+
+class CompactMinPriorityQueue:
+    """
+    A leaner version of MinPriorityQueue for when the elements are ints 0..capacity-1
+    (e.g. the node ids of a CSRGraph).
+
+    Instead of (element, priority) tuples everything lives in parallel arrays:
+        heap[i]    handle stored at heap position i
+        pos[h]     position of handle h in heap (-1 if h is not in the queue)
+        keys[h]    priority of h
+        ties[h]    second priority of h, only looked at when keys are equal
+                   (Dijkstra uses it for the edge count tie-break)
+    so comparing two entries is two array lookups and nothing gets allocated.
+    keys/ties keep their last value after a handle is extracted, so
+    extract_min() just returns the handle and the caller can read keys[h].
+
+    Sifting moves a "hole" instead of swapping pairs, and the parent of i is (i - 1) >> 1.
+    heapify() builds a heap of n entries in O(n) with Floyd's bottom-up method.
+    """
+
+    __slots__ = ("heap", "pos", "keys", "ties", "swaps")
+
+    def __init__(self, capacity):
+        self.heap = array('l')
+        self.pos = array('l', [-1]) * capacity
+        self.keys = array('d', [0.0]) * capacity
+        self.ties = array('d', [0.0]) * capacity
+        self.swaps = 0  # entries moved while sifting, same idea as MinPriorityQueue.swaps
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, h):
+        return self.pos[h] >= 0
+
+    def insert(self, h, key, tie=0):
+        self.keys[h] = key
+        self.ties[h] = tie
+        self.heap.append(h)
+        self.pos[h] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def insert_many(self, handles, keys, ties=None):
+        """Add a batch of entries (into an empty or non-empty queue) and re-heapify once."""
+        for k, h in enumerate(handles):
+            self.keys[h] = keys[k]
+            self.ties[h] = ties[k] if ties is not None else 0
+            self.pos[h] = len(self.heap)
+            self.heap.append(h)
+        self.heapify()
+
+    def heapify(self):
+        for i in range((len(self.heap) >> 1) - 1, -1, -1):
+            self._sift_down(i)
+
+    def minimum(self):
+        if not self.heap:
+            return None
+        return self.heap[0]
+
+    def extract_min(self):
+        heap = self.heap
+        if not heap:
+            return None
+        h = heap[0]
+        last = heap.pop()
+        self.pos[h] = -1
+        if heap:
+            heap[0] = last
+            self.pos[last] = 0
+            self._sift_down(0)
+        return h
+
+    def decrease_key(self, h, key, tie=0):
+        i = self.pos[h]
+        if i < 0:
+            return
+        keys, ties = self.keys, self.ties
+        if key > keys[h] or (key == keys[h] and tie >= ties[h]):
+            return
+        keys[h] = key
+        ties[h] = tie
+        self._sift_up(i)
+
+    def _sift_up(self, i):
+        heap, pos, keys, ties = self.heap, self.pos, self.keys, self.ties
+        h = heap[i]
+        k, t = keys[h], ties[h]
+        while i > 0:
+            p = (i - 1) >> 1
+            hp = heap[p]
+            kp = keys[hp]
+            if kp < k or (kp == k and ties[hp] <= t):
+                break
+            heap[i] = hp
+            pos[hp] = i
+            self.swaps += 1
+            i = p
+        heap[i] = h
+        pos[h] = i
+
+    def _sift_down(self, i):
+        heap, pos, keys, ties = self.heap, self.pos, self.keys, self.ties
+        n = len(heap)
+        h = heap[i]
+        k, t = keys[h], ties[h]
+        while True:
+            c = 2 * i + 1
+            if c >= n:
+                break
+            hc = heap[c]
+            kc, tc = keys[hc], ties[hc]
+            if c + 1 < n:
+                hr = heap[c + 1]
+                kr = keys[hr]
+                if kr < kc or (kr == kc and ties[hr] < tc):
+                    c += 1
+                    hc = hr
+                    kc = kr
+                    tc = ties[hr]
+            if k < kc or (k == kc and t <= tc):
+                break
+            heap[i] = hc
+            pos[hc] = i
+            self.swaps += 1
+            i = c
+        heap[i] = h
+        pos[h] = i
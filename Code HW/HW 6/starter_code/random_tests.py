@@ -0,0 +1,275 @@
+# random_tests.py
+# CS 330
+# Randomized checks of the extra shortest path modules against a fresh dijkstra(G, s):
+# repair_shortest_paths (dynamic_sssp.py), ContractionHierarchy (contraction.py),
+# LandmarkIndex (landmarks.py), the point-to-point searches dijkstra(G, s, target=t)
+# and bidirectional_dijkstra, and the queue="dial" and packed=True engines.
+#
+# Each check builds small random graphs (lots of equal weights and 0 weights, so the
+# fewest-edges tie-break gets exercised) and compares distances, plus the weight and
+# edge count of every tree path, with what dijkstra returns for the same graph.
+#
+#   python3 random_tests.py            # 300 graphs per check, seed 0
+#   python3 random_tests.py 2000 7     # 2000 graphs per check, seed 7
+
+import os
+import random
+import sys
+import tempfile
+from math import inf, isclose
+
+from contraction import ContractionHierarchy
+from dijkstra import bidirectional_dijkstra, dijkstra, path_to
+from dynamic_sssp import DynamicShortestPaths, repair_shortest_paths
+from frozen_graph import FrozenGraph
+from landmarks import LandmarkIndex
+from run_local_tests import implied_distances_from_parents
+
+
+def random_graph(rng, max_vertices=25, max_weight=3):
+    n = rng.randint(1, max_vertices)
+    G = {str(i): {} for i in range(n)}
+    for _ in range(rng.randint(0, 4 * n)):
+        u, v = rng.randrange(n), rng.randrange(n)
+        G[str(u)][str(v)] = float(rng.randint(0, max_weight))
+    return G
+
+
+def same_tree(G, s, d, parents, ref_d, ref_parents):
+    """True if d matches ref_d and both parent trees give the same path weights and edge counts."""
+    if d != ref_d:
+        return False
+    return (implied_distances_from_parents(parents, s, G)
+            == implied_distances_from_parents(ref_parents, s, G))
+
+
+def path_error(G, s, t, distance, path, ref_d, ref_hops):
+    """None if (distance, path) is a shortest s -> t path with as few edges as the
+    reference tree's, else what is wrong with it."""
+    if distance != ref_d[t]:
+        return f"{s} -> {t}: distance {distance}, dijkstra {ref_d[t]}"
+    if not path:
+        return None if distance == inf else f"{s} -> {t}: no path for distance {distance}"
+    if path[0] != s or path[-1] != t:
+        return f"{s} -> {t}: path {path} has the wrong ends"
+    if any(b not in G[a] for a, b in zip(path, path[1:])):
+        return f"{s} -> {t}: path {path} uses a missing edge"
+    if sum(G[a][b] for a, b in zip(path, path[1:])) != distance:
+        return f"{s} -> {t}: path {path} doesn't add up to {distance}"
+    if len(path) - 1 != ref_hops[t]:
+        return f"{s} -> {t}: path has {len(path) - 1} edges, dijkstra {ref_hops[t]}"
+    return None
+
+
+def random_changes(rng, G, max_weight=3):
+    """Delete, reweight or insert 1-4 edges of G in place and return the (u, v) pairs
+    touched. Inserted edges may bring a new vertex with them."""
+    n = len(G) + 1
+    changes = []
+    for _ in range(rng.randint(1, 4)):
+        edges = [(u, v) for u in G for v in G[u]]
+        r = rng.random()
+        if edges and r < 0.35:
+            u, v = rng.choice(edges)
+            del G[u][v]
+        elif edges and r < 0.7:
+            u, v = rng.choice(edges)
+            G[u][v] = float(rng.randint(0, max_weight))
+        else:
+            u, v = str(rng.randrange(n)), str(rng.randrange(n))
+            G.setdefault(u, {})[v] = float(rng.randint(0, max_weight))
+            G.setdefault(v, {})
+        changes.append((u, v))
+    return changes
+
+
+def check_dynamic_sssp(rng, trials):
+    """repair_shortest_paths after a few rounds of random edge changes, both called
+    directly and through DynamicShortestPaths (which keeps its own copy of G)."""
+    for trial in range(trials):
+        G = random_graph(rng)
+        s = "0"
+        d, parents = dijkstra(G, s)
+        sp = DynamicShortestPaths({u: dict(nbrs) for u, nbrs in G.items()}, s)
+        for round_ in range(4):
+            changes = random_changes(rng, G)
+            repair_shortest_paths(G, s, d, parents, changes)
+            sp.update([(u, v, G[u].get(v)) for u, v in changes])
+            ref_d, ref_parents = dijkstra(G, s)
+            if not same_tree(G, s, d, parents, ref_d, ref_parents):
+                return f"graph {trial}, round {round_}: repaired tree differs after {changes}"
+            if not same_tree(G, s, sp.d, sp.parents, ref_d, ref_parents):
+                return f"graph {trial}, round {round_}: DynamicShortestPaths differs after {changes}"
+    return None
+
+
+def check_contraction(rng, trials):
+    """ContractionHierarchy.query for every pair of vertices: same distance as dijkstra,
+    a real path in G of that weight, and as few edges as dijkstra's tree path. Small
+    witness limits (lots of extra shortcuts) and a save / load round trip included, on
+    int ids half the time so a loaded hierarchy has to keep the id type."""
+    for trial in range(trials):
+        G = random_graph(rng, max_vertices=15)
+        if trial % 20 == 10:
+            G = {int(u): {int(v): w for v, w in nbrs.items()} for u, nbrs in G.items()}
+        ch = ContractionHierarchy.build(G, witness_limit=rng.choice([1, 3, 50]))
+        if trial % 10 == 0:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "graph.ch.json")
+                ch.save(path)
+                ch = ContractionHierarchy.load(path)
+        try:
+            ch.query(next(iter(G)), "not a vertex")
+            return f"graph {trial}: query with an unknown vertex didn't raise KeyError"
+        except KeyError:
+            pass
+        for s in G:
+            d, parents = dijkstra(G, s)
+            _, hops = implied_distances_from_parents(parents, s, G)
+            for t in G:
+                error = path_error(G, s, t, *ch.query(s, t), d, hops)
+                if error:
+                    return f"graph {trial}: query {error}"
+    return None
+
+
+def check_alt(rng, trials):
+    """LandmarkIndex.query for every pair of vertices with 1, 2 or 4 landmarks, same
+    tests as check_contraction, including a save / load round trip."""
+    for trial in range(trials):
+        G = random_graph(rng, max_vertices=15)
+        index = LandmarkIndex.build(G, k=rng.choice([1, 2, 4]))
+        if trial % 10 == 0:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "graph.alt.json")
+                index.save(path)
+                index = LandmarkIndex.load(path)
+        for s in G:
+            d, parents = dijkstra(G, s)
+            _, hops = implied_distances_from_parents(parents, s, G)
+            for t in G:
+                error = path_error(G, s, t, *index.query(G, s, t), d, hops)
+                if error:
+                    return f"graph {trial}: query {error}"
+    return None
+
+
+def check_dial(rng, trials):
+    """queue="dial" against queue="binary": whole trees on dict graphs and FrozenGraphs
+    (whose weights are not scanned again), target= for every pair, and ValueError for
+    a fractional weight."""
+    for trial in range(trials):
+        G = random_graph(rng, max_vertices=25, max_weight=rng.choice([1, 1, 3, 20]))
+        frozen = FrozenGraph(G)
+        for s in G:
+            ref_d, ref_parents = dijkstra(G, s, queue="binary")
+            _, hops = implied_distances_from_parents(ref_parents, s, G)
+            for H, kind in ((G, "dict"), (frozen, "FrozenGraph")):
+                d, parents = dijkstra(H, s, queue="dial")
+                if not same_tree(G, s, d, parents, ref_d, ref_parents):
+                    return f"graph {trial}: {kind} tree from {s} differs"
+            for t in G:
+                d, parents = dijkstra(G, s, queue="dial", target=t)
+                error = path_error(G, s, t, d.get(t, inf), path_to(parents, t), ref_d, hops)
+                if error:
+                    return f"graph {trial}: target= {error}"
+        edges = [(u, v) for u in G for v in G[u]]
+        if edges:
+            u, v = rng.choice(edges)
+            G[u][v] += 0.5
+            for H, kind in ((G, "dict"), (FrozenGraph(G), "FrozenGraph")):
+                try:
+                    dijkstra(H, u, queue="dial")
+                    return f"graph {trial}: {kind} with weight {G[u][v]} didn't raise ValueError"
+                except ValueError:
+                    pass
+    return None
+
+
+def check_packed(rng, trials):
+    """packed=True against the tuple engine. Whole-number weights, as a dict and as a
+    FrozenGraph (which takes its H from num_vertices): the same tree. One-decimal
+    weights with scale=10: the same hop counts as the tuple engine on the weights * 10
+    (whose order is exact, unlike float sums of 0.1s), and distances equal up to
+    rounding. Weights that aren't whole after scaling must raise ValueError."""
+    for trial in range(trials):
+        G = random_graph(rng, max_vertices=15, max_weight=rng.choice([1, 3, 20]))
+        tenths = {u: {v: w / 10 for v, w in nbrs.items()} for u, nbrs in G.items()}
+        frozen = FrozenGraph(G)
+        for s in G:
+            ref_d, ref_parents = dijkstra(G, s, queue="binary")
+            for H, kind in ((G, "dict"), (frozen, "FrozenGraph")):
+                d, parents = dijkstra(H, s, packed=True)
+                if not same_tree(G, s, d, parents, ref_d, ref_parents):
+                    return f"graph {trial}: packed {kind} tree from {s} differs"
+            d, parents = dijkstra(tenths, s, packed=True, scale=10)
+            _, ref_hops = implied_distances_from_parents(ref_parents, s, G)
+            _, hops = implied_distances_from_parents(parents, s, tenths)
+            if hops != ref_hops:
+                return f"graph {trial}: scale=10 tree from {s} has other edge counts"
+            for v, x in ref_d.items():
+                if not (x == d[v] == inf or isclose(x / 10, d[v], abs_tol=1e-9)):
+                    return f"graph {trial}: scale=10 distance to {v} is {d[v]}, expected {x / 10}"
+        edges = [(u, v) for u in G for v in G[u]]
+        if edges:
+            u, v = rng.choice(edges)
+            for weight, scale in ((G[u][v] + 0.5, 1), (G[u][v] + 0.05, 10)):
+                H = {x: dict(nbrs) for x, nbrs in G.items()}
+                H[u][v] = weight
+                try:
+                    dijkstra(H, u, packed=True, scale=scale)
+                    return f"graph {trial}: weight {weight} with scale={scale} didn't raise ValueError"
+                except ValueError:
+                    pass
+    return None
+
+
+def check_point_to_point(rng, trials):
+    """dijkstra(G, s, target=t) and bidirectional_dijkstra for every pair of vertices
+    against a full dijkstra(G, s, queue="binary"): distance and fewest edges."""
+    for trial in range(trials):
+        G = random_graph(rng, max_vertices=15)
+        for s in G:
+            ref_d, ref_parents = dijkstra(G, s, queue="binary")
+            _, hops = implied_distances_from_parents(ref_parents, s, G)
+            for t in G:
+                for queue in (None, "binary"):
+                    d, parents = dijkstra(G, s, queue=queue, target=t)
+                    error = path_error(G, s, t, d.get(t, inf), path_to(parents, t), ref_d, hops)
+                    if error:
+                        return f"graph {trial}: target= (queue={queue!r}) {error}"
+                error = path_error(G, s, t, *bidirectional_dijkstra(G, s, t), ref_d, hops)
+                if error:
+                    return f"graph {trial}: bidirectional_dijkstra {error}"
+    return None
+
+
+CHECKS = [
+    ("dynamic_sssp", check_dynamic_sssp),
+    ("contraction", check_contraction),
+    ("landmarks", check_alt),
+    ("dial", check_dial),
+    ("packed", check_packed),
+    ("point_to_point", check_point_to_point),
+]
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    print(f"\n--- Randomized checks ({trials} graphs each, seed {seed}) ---")
+    failed = 0
+    for name, check in CHECKS:
+        error = check(random.Random(seed), trials)
+        if error is None:
+            print(f"  ✅ {name}")
+        else:
+            failed += 1
+            print(f"  ❌ {name}: {error}")
+    print(f"\n=== Summary: {len(CHECKS) - failed}/{len(CHECKS)} checks passed. ===")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Caching dijkstra results for graphs that are queried a lot more often than they change.
+
+VersionedGraph wraps the usual dict-of-dicts graph and counts changes: every
+add_edge / remove_edge / remove_vertex bumps G.version. It is a read-only Mapping
+otherwise, so dijkstra(G, s) works on it unchanged.
+
+SPTCache keeps (d, parents) for recently used (graph, source) pairs in an LRU that is
+bounded by a number of entries and (optionally) an approximate number of bytes. An entry
+remembers the graph version it was computed for and is thrown away when the version
+moved on. Plain dicts have no version, so their entries are only dropped by the LRU or
+by invalidate().
+
+    G = VersionedGraph(graph_dict)
+    cache = SPTCache(max_entries=500)
+    d, parents = cache.get(G, s)    # computes
+    d, parents = cache.get(G, s)    # hit
+    G.add_edge("a", "b", 2.0)
+    d, parents = cache.get(G, s)    # stale -> recomputes
+    print(cache.stats())
+"""
+
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from dijkstra import dijkstra
+
+
+class VersionedGraph(Mapping):
+    """G[u][v] = weight like a normal graph dict, plus a version counter.
+    G[u] is a read-only view, so every change has to go through the methods below
+    (and bump the version)."""
+
+    def __init__(self, G=None):
+        self._adj = {u: dict(neighbors) for u, neighbors in (G or {}).items()}
+        self.version = 0
+
+    def __getitem__(self, u):
+        return MappingProxyType(self._adj[u])
+
+    def __iter__(self):
+        return iter(self._adj)
+
+    def __len__(self):
+        return len(self._adj)
+
+    def add_edge(self, u, v, weight):
+        """Add the edge u -> v, or change its weight if it is already there."""
+        self._adj.setdefault(u, {})[v] = weight
+        self._adj.setdefault(v, {})
+        self.version += 1
+
+    def remove_edge(self, u, v):
+        del self._adj[u][v]
+        self.version += 1
+
+    def remove_vertex(self, u):
+        del self._adj[u]
+        for neighbors in self._adj.values():
+            neighbors.pop(u, None)
+        self.version += 1
+
+
+def _approx_size(d, parents):
+    # the two dicts plus their float values; keys are shared with the graph
+    return sys.getsizeof(d) + sys.getsizeof(parents) + 24 * len(d)
+
+
+class SPTCache:
+
+    def __init__(self, max_entries=128, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (id(G), s) -> (G, version, d, parents, size)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, G, s):
+        """(d, parents) for dijkstra(G, s), from the cache if it is still valid.
+        The dicts are shared between callers, so don't modify them."""
+        key = (id(G), s)
+        version = getattr(G, "version", None)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] == version:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[2], entry[3]
+            self.invalidations += 1
+            self._drop(key)
+        self.misses += 1
+        d, parents = dijkstra(G, s)
+        size = _approx_size(d, parents)
+        # the entry keeps G alive, so id(G) can't be reused by another graph meanwhile
+        self._entries[key] = (G, version, d, parents, size)
+        self._bytes += size
+        self._evict()
+        return d, parents
+
+    def invalidate(self, G=None):
+        """Forget everything computed for G (or everything, if G is None)."""
+        for key in list(self._entries):
+            if G is None or key[0] == id(G):
+                self.invalidations += 1
+                self._drop(key)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "approx_bytes": self._bytes,
+        }
+
+    def _drop(self, key):
+        self._bytes -= self._entries.pop(key)[4]
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or
+                                 (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            key = next(iter(self._entries))
+            self._drop(key)
+            self.evictions += 1
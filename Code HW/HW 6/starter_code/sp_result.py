@@ -0,0 +1,138 @@
+"""
+A compact result type for dijkstra on big graphs.
+
+dijkstra normally returns two dicts over every vertex, d and parents. On a graph with
+millions of vertices those dicts (plus the float objects in d) are most of the memory a
+query keeps around. dijkstra(G, s, compact=True) runs the CSRGraph engine and returns a
+ShortestPaths instead, which keeps one entry per int node id in typed arrays:
+
+    dist[i]    float64, inf if i is not reached
+    parent[i]  int32 id of the parent, -1 for s and unreached nodes
+    hops[i]    int32 edge count of the tree path, -1 for unreached nodes
+
+That is 16 bytes per vertex, against roughly 100 for the two dicts and their floats.
+
+Old code keeps working: a ShortestPaths unpacks like the tuple,
+
+    d, parents = dijkstra(G, s, compact=True)
+
+where d and parents are read-only Mapping views keyed by the original labels. They
+build their values on access and never copy the arrays. result.path_to(t) and
+result.paths_to(targets) read paths straight off the arrays.
+"""
+
+from array import array
+from collections.abc import Mapping
+from math import inf
+
+
+class ShortestPaths:
+
+    def __init__(self, G, source, dist, parent, hops, complete=True):
+        """G is the CSRGraph that was searched and the lists are indexed by its int ids.
+        complete=False (a search stopped at a target) means only settled nodes count as
+        reached, i.e. the ones with dist < inf."""
+        self.graph = G
+        self.source = source
+        self.dist = array('d', dist)
+        self.parent = array('i', parent)
+        self.hops = array('i', [int(h) if x < inf else -1 for h, x in zip(hops, self.dist)])
+        if not complete:
+            for i, x in enumerate(self.dist):
+                if x == inf:
+                    self.parent[i] = -1
+        self.complete = complete
+
+    def __iter__(self):
+        # lets `d, parents = result` work like the tuple dijkstra returns
+        yield self.d
+        yield self.parents
+
+    @property
+    def d(self):
+        return _DistanceView(self)
+
+    @property
+    def parents(self):
+        return _ParentView(self)
+
+    def _id(self, t):
+        # int id of t if it was reached, else -1
+        i = self.graph.ids.get(t, -1)
+        if i < 0 or self.dist[i] == inf:
+            return -1
+        return i
+
+    def distance(self, t):
+        i = self.graph.ids.get(t, -1)
+        return inf if i < 0 else self.dist[i]
+
+    def edge_count(self, t):
+        """Number of edges on the tree path to t, or -1 if t is not reached."""
+        i = self._id(t)
+        return -1 if i < 0 else self.hops[i]
+
+    def path_to(self, t):
+        """The path [s, ..., t] in the shortest path tree, or [] if t was not reached."""
+        i = self._id(t)
+        if i < 0:
+            return []
+        labels, parent = self.graph.labels, self.parent
+        path = [None] * (self.hops[i] + 1)
+        k = len(path) - 1
+        while i >= 0:
+            path[k] = labels[i]
+            i = parent[i]
+            k -= 1
+        return path
+
+    def paths_to(self, targets):
+        """{t: path_to(t)} for every t in targets."""
+        return {t: self.path_to(t) for t in targets}
+
+    def nbytes(self):
+        """Bytes held by the three arrays."""
+        return sum(a.itemsize * len(a) for a in (self.dist, self.parent, self.hops))
+
+
+class _ResultView(Mapping):
+    """Read-only label -> value view over a ShortestPaths. A complete search covers every
+    vertex of the graph, a search with a target only the settled ones, like dijkstra."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def _ids(self):
+        dist = self._result.dist
+        if self._result.complete:
+            return range(len(dist))
+        return (i for i, x in enumerate(dist) if x < inf)
+
+    def __getitem__(self, u):
+        result = self._result
+        i = result.graph.ids[u]
+        if not result.complete and result.dist[i] == inf:
+            raise KeyError(u)
+        return self._value(i)
+
+    def __iter__(self):
+        labels = self._result.graph.labels
+        return (labels[i] for i in self._ids())
+
+    def __len__(self):
+        if self._result.complete:
+            return len(self._result.dist)
+        return sum(1 for _ in self._ids())
+
+
+class _DistanceView(_ResultView):
+
+    def _value(self, i):
+        return self._result.dist[i]
+
+
+class _ParentView(_ResultView):
+
+    def _value(self, i):
+        p = self._result.parent[i]
+        return None if p < 0 else self._result.graph.labels[p]